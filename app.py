@@ -1,666 +1,639 @@
+import os
+from datetime import date, datetime
+
 import streamlit as st
 import pandas as pd
 import altair as alt
 import plotly.express as px
 
+# Copy-on-write: frames derived from the shared snapshot never mutate it (always on from pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 st.set_page_config(page_title="KG DEI", page_icon=":bar_chart:", layout="wide")
 
 from streamlit_gsheets import GSheetsConnection
 
-# Create a connection object.
-conn = st.connection("gsheets", type=GSheetsConnection)
-df = conn.read()
-
-# Replace NaN values in the 'layer' column with "N-A" for display and filtering purposes
-df['layer'] = df['layer'].fillna("N-A")
-
-st.sidebar.header('KG DEI Dashboard')
-st.sidebar.header('Metrics')
-
-# Page selection with a blank option
-pages = ['', 'Gender', 'Generation', 'Religion', 'Tenure', 'Region', 'Age']
-selected_page = st.sidebar.selectbox("Choose the Metrics you want to display:", pages)
-
-st.sidebar.header('Breakdown Variable')
-
-# Add Breakdown Variable Selection
-breakdown_options = ['unit', 'subunit', 'layer']
-selected_breakdown = st.sidebar.selectbox("Breakdown Variable", breakdown_options)
-
-# Sidebar Widgets
-st.sidebar.header('Filters')
-
-# Unit, Subunit, and Layer Filters using multiselect without "All" option
-unit_options = df['unit'].unique().tolist()
-subunit_options = df['subunit'].unique().tolist() if 'subunit' in df.columns else []
-layer_options = df['layer'].unique().tolist() if 'layer' in df.columns else []
-
-# Multiselect filters for Unit, Subunit, and Layer
-selected_units = st.sidebar.multiselect("Select Unit(s)", unit_options)
-selected_subunits = st.sidebar.multiselect("Select Subunit(s)", subunit_options)
-selected_layers = st.sidebar.multiselect("Select Layer(s)", layer_options)
-
-# Additional Filters for Gender, Generation, Religion, and Tenure
-gender_options = df['gender'].unique().tolist() if 'gender' in df.columns else []
-generation_options = df['generation'].unique().tolist() if 'generation' in df.columns else []
-religion_options = df['Religious Denomination Key'].unique().tolist() if 'Religious Denomination Key' in df.columns else []
-tenure_options = ['<1 Year', '1-3 Year', '4-6 Year', '6-10 Year', '11-15 Year', '16-20 Year', '20-25 Year', '>25 Year']
-
-# Multiselect filters for Gender, Generation, Religion, and Tenure
-selected_genders = st.sidebar.multiselect("Select Gender(s)", gender_options)
-selected_generations = st.sidebar.multiselect("Select Generation(s)", generation_options)
-selected_religions = st.sidebar.multiselect("Select Religion(s)", religion_options)
-selected_tenures = st.sidebar.multiselect("Select Tenure(s)", tenure_options)
-
-# Filter the data based on selected units, subunits, layers, and additional criteria
-filtered_df = df.copy()
-
-# Apply filters only if specific options are selected; otherwise, keep the full dataset
-if selected_units:
-    filtered_df = filtered_df[filtered_df['unit'].isin(selected_units)]
-
-if selected_subunits and 'subunit' in filtered_df.columns:
-    filtered_df = filtered_df[filtered_df['subunit'].isin(selected_subunits)]
-
-# Adjust filter logic for 'layer' to include "N-A" option for missing data
-if selected_layers and 'layer' in filtered_df.columns:
-    if "N-A" in selected_layers:
-        filtered_df = filtered_df[filtered_df['layer'].isin(selected_layers) | (filtered_df['layer'] == "N-A")]
+from employee.access import EVERYTHING, grant_for, grant_key, load_grants, scope_mask
+from employee.crosstab import count_tensor, shares, top_counts
+from employee.derive import HIRE_DATE, has_dates
+from employee.dimensions import (
+    BREAKDOWNS, COUNT_PAGES, CUBE_COLUMNS, DIMENSION_PAGES, DIMENSIONS, FILTER_COLUMNS, SOURCE_COLUMNS,
+)
+from employee.figures import count_bar, cycle_colors, pivot_heatmap, stacked_percentage_bar, trend_lines
+from employee.history import HistoryStore
+from employee.memo import MemoCache, normalize_selections
+from employee.instrument import Profiler, profiling_requested
+from employee.memory import traced
+from employee.metrics import counts, dimension_crosstab, load_cube
+from employee.normalize import normalize
+from employee.render import count_columns
+from employee.shared import SharedStore
+from employee.snapshot import SnapshotStore
+from employee.sources import GSheetsSource, SlowSource, local_source
+from employee.suppress import (
+    hidden_options, options_min_cell, page_min_cell, selection_withheld, suppress_counts, suppress_long,
+)
+
+# How long (in seconds) a loaded snapshot is served before the sheet is checked again.
+# Stale data keeps being served while the re-read runs in the background.
+DATA_TTL = int(os.environ.get("EMPLOYEE_DATA_TTL", "600"))
+
+# Background re-read period in seconds (0 = only when a rerun finds the data stale)
+REFRESH_INTERVAL = int(os.environ.get("EMPLOYEE_REFRESH_INTERVAL", str(DATA_TTL)))
+
+# Directory of the append-only history behind the Trends page ('' disables it)
+HISTORY_PATH = os.environ.get("EMPLOYEE_HISTORY_PATH", "history")
+
+# Dimension counts (and any counts under a dimension filter) of fewer people than
+# this are suppressed, together with the complementary cells that would give them
+# away (0 = off)
+MIN_CELL_SIZE = int(os.environ.get("EMPLOYEE_MIN_CELL_SIZE", "0"))
+
+# JSON mapping of users to the units/subunits they may see (employee.access);
+# unset shows every unit to everyone
+ACCESS_PATH = os.environ.get("EMPLOYEE_ACCESS_PATH", "")
+
+# Request header with the user's email when a proxy does the sign-in instead of st.login
+USER_HEADER = os.environ.get("EMPLOYEE_USER_HEADER", "")
+
+# Show a tracemalloc report of the page render in the sidebar
+MEMORY_REPORT = os.environ.get("EMPLOYEE_MEMORY_REPORT") == "1"
+
+# One shared store per server process: a single normalized frame and its cube,
+# leased read-only by every session's reruns. Only SOURCE_COLUMNS are loaded.
+# EMPLOYEE_DATA_PATH points at a local CSV, Parquet or Arrow file instead of the sheet.
+@st.cache_resource
+def get_shared_store():
+    if os.environ.get("EMPLOYEE_DATA_PATH"):
+        source = local_source(os.environ["EMPLOYEE_DATA_PATH"], SOURCE_COLUMNS)
+        # Simulated sheet latency for trying out background refresh locally
+        if os.environ.get("EMPLOYEE_SOURCE_LATENCY"):
+            source = SlowSource(source, float(os.environ["EMPLOYEE_SOURCE_LATENCY"]))
     else:
-        filtered_df = filtered_df[filtered_df['layer'].isin(selected_layers)]
-
-# Filter for Gender, Generation, Religion, and Tenure
-if selected_genders and 'gender' in filtered_df.columns:
-    filtered_df = filtered_df[filtered_df['gender'].isin(selected_genders)]
-
-if selected_generations and 'generation' in filtered_df.columns:
-    filtered_df = filtered_df[filtered_df['generation'].isin(selected_generations)]
-
-if selected_religions and 'Religious Denomination Key' in filtered_df.columns:
-    filtered_df = filtered_df[filtered_df['Religious Denomination Key'].isin(selected_religions)]
-
-# For tenure, categorize 'Years' column and filter based on selected tenure groups
-bins = [-1, 1, 3, 6, 10, 15, 20, 25, float('inf')]
-labels = ['<1 Year', '1-3 Year', '4-6 Year', '6-10 Year', '11-15 Year', '16-20 Year', '20-25 Year', '>25 Year']
-filtered_df['Service_Group'] = pd.cut(filtered_df['Years'], bins=bins, labels=labels, right=False)
-
-if selected_tenures:
-    filtered_df = filtered_df[filtered_df['Service_Group'].isin(selected_tenures)]
-
-# Display total employee count
-def display_total_employees_with_breakdown():
-    total_employees = len(filtered_df)
-    st.title("Total Employees")
-    st.subheader(f"{total_employees:,}")
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-    
-    # Group by the selected breakdown and count employees
-    breakdown_counts = (
-        filtered_df.groupby(selected_breakdown)
-        .size()
-        .reset_index(name="Count")
-        .sort_values("Count", ascending=False)
-    )
-    breakdown_counts.rename(columns={selected_breakdown: selected_breakdown.capitalize()}, inplace=True)
-    
-    # Convert the Count column to integer for clean display
-    breakdown_counts["Count"] = breakdown_counts["Count"].astype(int)
-    
-    # Display the counts in two columns
-    st.markdown("### Employee Count by Breakdown")
-    col1, col2 = st.columns(2)
-    midpoint = len(breakdown_counts) // 2 + len(breakdown_counts) % 2  # Split data into two parts
-    for i, row in breakdown_counts.iterrows():
-        if i < midpoint:
-            col1.write(f"**{row[selected_breakdown.capitalize()]}**: {row['Count']:,}")
-        else:
-            col2.write(f"**{row[selected_breakdown.capitalize()]}**: {row['Count']:,}")
-    
-    # Create a horizontal bar chart
-    fig = px.bar(
-        breakdown_counts,
-        x="Count",
-        y=selected_breakdown.capitalize(),
-        orientation="h",
-        text="Count",
-        labels={"Count": "Employee Count"},
-    )
-    
-    fig.update_traces(textposition="inside")
-    fig.update_layout(
-        title=f"Employee Distribution by {selected_breakdown.capitalize()}",
-        xaxis_title="Count",
-        yaxis_title=selected_breakdown.capitalize(),
-        bargap=0.2,
-        height=600,
-        width=800,
-    )
-    
-    # Display the chart
-    st.plotly_chart(fig, use_container_width=True)
-
-# Function to display gender summary
-def display_gender_summary():
-    # Replace missing values in 'layer' column with "N-A"
-    df['layer'] = df['layer'].fillna("N-A")
-    filtered_df['layer'] = filtered_df['layer'].fillna("N-A")
-
-    # Select the correct DataFrame based on filters
-    display_df = filtered_df.copy()
-
-    # Group by the selected breakdown variable and calculate gender distribution
-    gender_counts = display_df.groupby([selected_breakdown, 'gender']).size().unstack().fillna(0)
-
-    # Ensure that 'Male' and 'Female' exist in the groupby result
-    if 'Male' not in gender_counts.columns:
-        gender_counts['Male'] = 0
-    if 'Female' not in gender_counts.columns:
-        gender_counts['Female'] = 0
-
-    # Calculate percentages for each gender
-    gender_percentage = gender_counts.div(gender_counts.sum(axis=1), axis=0) * 100
-    gender_percentage = gender_percentage.reset_index()
-
-    # Combine count and percentage data
-    gender_combined = gender_percentage.melt(id_vars=[selected_breakdown], value_vars=['Male', 'Female'],
-                                             var_name='Gender', value_name='Percentage')
-    gender_combined = gender_combined.merge(
-        gender_counts.reset_index().melt(id_vars=[selected_breakdown], value_vars=['Male', 'Female'],
-                                         var_name='Gender', value_name='Count'),
-        on=[selected_breakdown, 'Gender']
-    )
-    gender_combined['Label'] = gender_combined.apply(
-        lambda row: f"{int(row['Count'])} ({row['Percentage']:.1f}%)", axis=1
-    )
-
-    # Display title with filter details
-    title_text = "Gender Metrics (All Units)" if not selected_units and not selected_subunits and not selected_layers else f"Gender Metrics (Filtered by {', '.join(selected_units)}, {', '.join(selected_subunits)}, {', '.join(selected_layers)})"
-    st.title(title_text)
-    st.subheader(f"Percentage of Gender by {selected_breakdown}")
-
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Display total counts and percentages
-    total_male = gender_counts['Male'].sum()
-    total_female = gender_counts['Female'].sum()
-    total_people = total_male + total_female
-    male_percentage = (total_male / total_people * 100).round(2) if total_people > 0 else 0
-    female_percentage = (total_female / total_people * 100).round(2) if total_people > 0 else 0
-
-    col1, col2 = st.columns(2)
-    col1.markdown(f"<div style='text-align: center'><h5>Male</h5><h1><strong>{male_percentage}%</strong></h1><p>{int(total_male)}</p></div>", unsafe_allow_html=True)
-    col2.markdown(f"<div style='text-align: center'><h5>Female</h5><h1><strong>{female_percentage}%</strong></h1><p>{int(total_female)}</p></div>", unsafe_allow_html=True)
-
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Plotly stacked bar chart
-    fig = px.bar(
-        gender_combined,
-        x="Percentage",
-        y=selected_breakdown,
-        color="Gender",
-        orientation="h",
-        text="Label",
-        color_discrete_map={'Male': '#90d5ff', 'Female': '#ffb5c0'},
-        labels={
-            "Percentage": "Percentage (%)",
-            selected_breakdown: selected_breakdown.capitalize(),
-            "Gender": "Gender"
-        },
-    )
-
-    # Update layout to improve readability
-    fig.update_traces(textposition="inside", insidetextanchor="middle")
-    fig.update_layout(
-        title=f"Gender Distribution by {selected_breakdown}",
-        xaxis_title="Percentage (%)",
-        yaxis_title=selected_breakdown.capitalize(),
-        bargap=0.2,
-        height=600,
-        width=800,
-        legend_title="Gender"
-    )
-
-    # Display the Plotly chart in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-
-# Function to display generation summary
-def display_generation_summary():
-    # Replace missing values in 'layer' column with "N-A"
-    df['layer'] = df['layer'].fillna("N-A")
-    filtered_df['layer'] = filtered_df['layer'].fillna("N-A")
-
-    # Select the correct DataFrame based on filters
-    display_df = filtered_df.copy()
-
-    # Group by the selected breakdown and calculate generation distribution
-    generation_counts = display_df.groupby([selected_breakdown, 'generation']).size().unstack().fillna(0)
-
-    # Define color map for generations
-    color_map = {
-        'POST WAR': '#9467bd',  # Purple
-        'BOOMERS': '#1f77b4',  # Blue
-        'GEN X': '#ff7f0e',    # Orange
-        'GEN Y': '#2ca02c',    # Green
-        'GEN Z': '#d62728'     # Red
-    }
-
-    # Ensure all generations are represented in the data
-    for generation in color_map.keys():
-        if generation not in generation_counts.columns:
-            generation_counts[generation] = 0
-
-    # Calculate percentages for each generation
-    generation_percentage = generation_counts.div(generation_counts.sum(axis=1), axis=0) * 100
-    generation_percentage = generation_percentage.reset_index()
-
-    # Combine count and percentage data for tooltips and text labels
-    generation_combined = generation_percentage.melt(id_vars=[selected_breakdown], value_vars=list(color_map.keys()),
-                                                     var_name='Generation', value_name='Percentage')
-    generation_combined = generation_combined.merge(
-        generation_counts.reset_index().melt(id_vars=[selected_breakdown], value_vars=list(color_map.keys()),
-                                             var_name='Generation', value_name='Count'),
-        on=[selected_breakdown, 'Generation']
-    )
-    generation_combined['Label'] = generation_combined.apply(
-        lambda row: f"{int(row['Count'])} ({row['Percentage']:.1f}%)", axis=1
-    )
-
-    # Display title with filter details
-    title_text = "Generation Metrics (All Units)" if not selected_units and not selected_subunits and not selected_layers else f"Generation Metrics (Filtered by {', '.join(selected_units)}, {', '.join(selected_subunits)}, {', '.join(selected_layers)})"
-    st.title(title_text)
-    st.subheader(f"Percentage of Generation by {selected_breakdown}")
-
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Display total counts and percentages with birth year ranges
-    total_counts = generation_counts.sum().sum()
-    total_percentage = {gen: (generation_counts[gen].sum() / total_counts * 100).round(2) if total_counts > 0 else 0 for gen in color_map.keys()}
-
-    # Define birth year ranges for each generation
-    birth_year_ranges = {
-        'POST WAR': '(1928-1945)',
-        'BOOMERS': '(1946-1964)',
-        'GEN X': '(1965-1980)',
-        'GEN Y': '(1981-1996)',
-        'GEN Z': '(1997-2012)'
-    }
-
-    # Display generation information with birth years
-    cols = st.columns(len(color_map.keys()))
-    for i, (gen, color) in enumerate(color_map.items()):
-        birth_year_range = birth_year_ranges.get(gen, "")
-        cols[i].markdown(f"""
-            <div style='text-align: center'>
-                <h5 style="margin-bottom: 0;">{gen}</h5>
-                <h5 style='margin-top: 0; margin-bottom: 0;'>{birth_year_range}</h5>
-                <h1><strong>{total_percentage[gen]}%</strong></h1>
-                <p>{int(generation_counts[gen].sum())}</p>
-            </div>
-            """, unsafe_allow_html=True)
+        # Create a connection object.
+        source = GSheetsSource(st.connection("gsheets", type=GSheetsConnection), SOURCE_COLUMNS)
+    # Every new data version is also appended to the history for the Trends page
+    history = HistoryStore(HISTORY_PATH) if HISTORY_PATH else None
+    shared = SharedStore(SnapshotStore(source, ttl=DATA_TTL, prepare=normalize), CUBE_COLUMNS, history=history)
+    if REFRESH_INTERVAL > 0:
+        shared.start_refresher(REFRESH_INTERVAL)
+    return shared
+
+shared = get_shared_store()
+st.sidebar.header('KG DEI Dashboard')
 
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Plotly stacked bar chart
-    fig = px.bar(
-        generation_combined,
-        x="Percentage",
-        y=selected_breakdown,
-        color="Generation",
-        orientation="h",
-        text="Label",
-        color_discrete_map=color_map,
-        labels={
-            "Percentage": "Percentage (%)",
-            selected_breakdown: selected_breakdown.capitalize(),
-            "Generation": "Generation"
-        },
-    )
-
-    # Update layout to improve readability
-    fig.update_traces(textposition="inside", insidetextanchor="middle")
-    fig.update_layout(
-        title=f"Generation Distribution by {selected_breakdown}",
-        xaxis_title="Percentage (%)",
-        yaxis_title=selected_breakdown.capitalize(),
-        bargap=0.2,
-        height=600,
-        width=800,
-        legend_title="Generation"
-    )
-
-    # Display the Plotly chart in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-
-# Function to display religion summary
-def display_religion_summary():
-    # Replace missing values in 'layer' column with "N-A"
-    df['layer'] = df['layer'].fillna("N-A")
-    filtered_df['layer'] = filtered_df['layer'].fillna("N-A")
-
-    # Select the correct DataFrame based on filters
-    display_df = filtered_df.copy()
-
-    # Calculate religion distribution by selected breakdown
-    religion_counts = display_df.groupby([selected_breakdown, 'Religious Denomination Key']).size().unstack().fillna(0)
-
-    # Define color map for religions
-    color_map = {
-        'Islam': '#1f77b4',       # Blue
-        'Kristen': '#ff7f0e',     # Orange
-        'Katholik': '#2ca02c',    # Green
-        'Hindu': '#d62728',       # Red
-        'Buddha': '#9467bd',      # Purple
-        'Kepercayaan': '#8c564b', # Brown
-        'Kong Hu Cu': '#e377c2'   # Pink
+# Opt-in per-rerun timings (?profile=1 or EMPLOYEE_PROFILE=1), shown in the sidebar
+# and appended as spans to EMPLOYEE_PROFILE_LOG
+profiler = Profiler(
+    profiling_requested(st.query_params),
+    log_path=os.environ.get("EMPLOYEE_PROFILE_LOG", "profile.jsonl"),
+)
+
+# Lease the current data for this rerun; manual refresh bypasses the TTL
+with profiler.span("data/read") as span:
+    view = shared.acquire(refresh=st.sidebar.button("Refresh data"))
+    span['version'] = view.version[:12]
+    span['cells'] = len(view.cube.cells)
+# Everything after the lease runs inside it: the lease is released and the profile
+# flushed (releasing tracemalloc) however the rerun ends, st.stop() and errors included
+try:
+    snapshot = view.snapshot
+    st.sidebar.caption(f"Data as of: {datetime.fromtimestamp(snapshot.loaded_at):%Y-%m-%d %H:%M:%S}"
+                       f" (checked {datetime.fromtimestamp(snapshot.checked_at):%H:%M:%S})")
+    if shared.refreshing:
+        st.sidebar.caption("Refreshing data in the background...")
+    if shared.last_error is not None:
+        st.sidebar.warning(f"Background refresh failed, showing earlier data: {shared.last_error}")
+
+    # Normalized once per load ('layer' filled, tenure binned; every row, hired yet or not)
+    # and shared read-only across reruns
+    df = view.frame
+
+    # Employee counts per combination of every filter column plus age and region,
+    # maintained once per data version
+    cube = view.cube
+
+    # Cube with age, generation and tenure re-derived from birth and hire dates as of
+    # another day; one per (data version, day), shared by every session
+    @st.cache_resource(max_entries=8)
+    def get_as_of_cube(version, as_of, _frame):
+        return load_cube(_frame, as_of)
+
+    # Sheets with birth and hire dates can be viewed as of any day. The shared cube is
+    # derived as of the day the data was loaded; other days are derived on demand.
+    as_of = None
+    if has_dates(df):
+        first_hire = df[HIRE_DATE].min() if HIRE_DATE in df.columns else pd.NaT
+        as_of = st.sidebar.date_input(
+            "As of",
+            value=date.today(),
+            min_value=date(1900, 1, 1) if pd.isna(first_hire) else pd.Timestamp(first_hire).date(),
+            max_value=date.today(),
+        )
+        if as_of != datetime.fromtimestamp(snapshot.loaded_at).date():
+            with profiler.span("data/as_of", as_of=str(as_of)):
+                cube = get_as_of_cube(snapshot.version, as_of, df)
+
+    # Access mapping, re-read when the file changes
+    @st.cache_resource(max_entries=1)
+    def get_grants(path, modified):
+        return load_grants(path)
+
+    # Cells a grant may see, built once per cube and shared by every user with that grant
+    @st.cache_resource(max_entries=64)
+    def get_scope(version, as_of, key, _cube, _grant):
+        return scope_mask(_cube.index, _grant)
+
+    # Scope this session to the signed-in user's units and subunits; filters, option
+    # lists and the Trends page all stay inside it
+    grant = EVERYTHING
+    if ACCESS_PATH:
+        user = st.user.get("email") or (st.context.headers.get(USER_HEADER) if USER_HEADER else None)
+        grant = grant_for(get_grants(ACCESS_PATH, os.path.getmtime(ACCESS_PATH)), user)
+    scope_key = grant_key(grant)
+    scope = get_scope(snapshot.version, as_of, scope_key, cube, grant)
+    if scope is not None and not scope.any():
+        st.error("Your account has no access to any unit in this dashboard.")
+        st.stop()
+
+    st.sidebar.header('Metrics')
+
+    # Page selection with a blank option; one page per dimension the data has, and a
+    # page comparing any two of them
+    present_dimensions = [dimension for dimension in DIMENSIONS if dimension.column in df.columns]
+    pages = [''] + [dimension.page for dimension in present_dimensions] + (['Compare'] if len(present_dimensions) > 1 else []) + ['Region', 'Age', 'Trends']
+    selected_page = st.sidebar.selectbox("Choose the Metrics you want to display:", pages)
+
+    st.sidebar.header('Breakdown Variable')
+
+    # Add Breakdown Variable Selection; count pages (Region, Age) are not broken down,
+    # so the controls stay visible but disabled and keep their values
+    uses_breakdown = selected_page not in COUNT_PAGES
+    breakdown_options = BREAKDOWNS
+    selected_breakdown = st.sidebar.selectbox("Breakdown Variable", breakdown_options, disabled=not uses_breakdown)
+
+    # Charts can fold the smaller breakdown values into a single "Other" bar
+    top_n = st.sidebar.number_input("Chart top N values (0 = all)", min_value=0, value=0, step=5, disabled=not uses_breakdown)
+    if not uses_breakdown:
+        selected_breakdown, top_n = None, 0
+
+    # Sidebar Widgets
+    st.sidebar.header('Filters')
+
+    # Cascading options: each filter lists only the values that co-occur with the other
+    # filters' current selections (read from session state before the widgets are drawn),
+    # with their employee counts, looked up in the cube's value index
+    current_selections = {col: st.session_state.get(f"filter_{col}", []) for col in FILTER_COLUMNS}
+
+    # Option counts of a column with no other filter set, counted once per cube and
+    # grant instead of over every cell on each rerun
+    @st.cache_resource(max_entries=256)
+    def get_all_options(version, as_of, key, column, _cube, _scope):
+        return _cube.options(column, {}, _scope)
+
+    # Only columns narrowed by another column's selection are counted again
+    def column_options(column, selections):
+        if any(values for col, values in selections.items() if col != column):
+            return cube.options(column, selections, scope)
+        return get_all_options(snapshot.version, as_of, scope_key, column, cube, scope)
+
+    def filter_multiselect(label, column):
+        if column not in cube.index.columns:
+            return []
+        options = column_options(column, current_selections)
+        # Counts of a dimension's values, or of any values under a dimension filter, are
+        # dimension cells and get the small-cell suppression of the dimension pages
+        min_cell = options_min_cell(column, current_selections, MIN_CELL_SIZE)
+        hidden = hidden_options(options, min_cell) if min_cell else set()
+        # Keep chosen values listed even when other filters leave them with no employees
+        values = list(options) + [value for value in current_selections[column] if value not in options]
+        return st.sidebar.multiselect(
+            label,
+            values,
+            format_func=lambda value: f"{value} (withheld)" if value in hidden else f"{value} ({options.get(value, 0):,})",
+            key=f"filter_{column}",
+        )
+
+    # Multiselect filters for Unit, Subunit, and Layer
+    selected_units = filter_multiselect("Select Unit(s)", 'unit')
+    selected_subunits = filter_multiselect("Select Subunit(s)", 'subunit')
+    selected_layers = filter_multiselect("Select Layer(s)", 'layer')
+
+    # One multiselect filter per dimension (Gender, Generation, Religion, Tenure, ...)
+    selected_dimensions = {
+        dimension.column: filter_multiselect(f"Select {dimension.page}(s)", dimension.column)
+        for dimension in DIMENSIONS
     }
 
-    # Ensure all religions are present in the data
-    for religion in color_map.keys():
-        if religion not in religion_counts.columns:
-            religion_counts[religion] = 0
-
-    # Calculate religion percentages
-    religion_percentage = religion_counts.div(religion_counts.sum(axis=1), axis=0) * 100
-    religion_percentage = religion_percentage.reset_index()
-
-    # Combine count and percentage data for tooltips and text labels
-    religion_combined = religion_percentage.melt(id_vars=[selected_breakdown], value_vars=list(color_map.keys()),
-                                                 var_name='Religion', value_name='Percentage')
-    religion_combined = religion_combined.merge(
-        religion_counts.reset_index().melt(id_vars=[selected_breakdown], value_vars=list(color_map.keys()),
-                                           var_name='Religion', value_name='Count'),
-        on=[selected_breakdown, 'Religion']
-    )
-    religion_combined['Label'] = religion_combined.apply(
-        lambda row: f"{int(row['Count'])} ({row['Percentage']:.1f}%)", axis=1
-    )
-
-    # Display title with filter details
-    title_text = "Religion Metrics (All Units)" if not selected_units and not selected_subunits and not selected_layers else f"Religion Metrics (Filtered by {', '.join(selected_units)}, {', '.join(selected_subunits)}, {', '.join(selected_layers)})"
-    st.title(title_text)
-    st.subheader(f"Percentage of Religion by {selected_breakdown}")
-
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Display total counts and percentages
-    total_counts = religion_counts.sum().sum()
-    total_percentage = {rel: (religion_counts[rel].sum() / total_counts * 100).round(2) if total_counts > 0 else 0 for rel in color_map.keys()}
-
-    # Display religion summary with percentages and counts
-    cols = st.columns(len(color_map.keys()))
-    for i, (rel, color) in enumerate(color_map.items()):
-        cols[i].markdown(f"""
-            <div style='text-align: center'>
-                <h5 style="margin-bottom: 0;">{rel}</h5>
-                <h1><strong>{total_percentage[rel]}%</strong></h1>
-                <p>{int(religion_counts[rel].sum())}</p>
-            </div>
-            """, unsafe_allow_html=True)
-
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Plotly stacked bar chart
-    fig = px.bar(
-        religion_combined,
-        x="Percentage",
-        y=selected_breakdown,
-        color="Religion",
-        orientation="h",
-        text="Label",
-        color_discrete_map=color_map,
-        labels={
-            "Percentage": "Percentage (%)",
-            selected_breakdown: selected_breakdown.capitalize(),
-            "Religion": "Religion"
-        },
-    )
-
-    # Update layout to improve readability
-    fig.update_traces(textposition="inside", insidetextanchor="middle")
-    fig.update_layout(
-        title=f"Religion Distribution by {selected_breakdown}",
-        xaxis_title="Percentage (%)",
-        yaxis_title=selected_breakdown.capitalize(),
-        bargap=0.2,
-        height=600,
-        width=800,
-        legend_title="Religion"
-    )
-
-    # Display the Plotly chart in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-
-# Function to display tenure summary
-def display_tenure_summary():
-    # Replace missing values in 'layer' column with "N-A"
-    df['layer'] = df['layer'].fillna("N-A")
-    filtered_df['layer'] = filtered_df['layer'].fillna("N-A")
-
-    # Select the correct DataFrame based on filters
-    display_df = filtered_df.copy()
-
-    # Define tenure groups and categorize them
-    bins = [-1, 1, 3, 6, 10, 15, 20, 25, float('inf')]
-    labels = ['<1 Year', '1-3 Year', '4-6 Year', '6-10 Year', '11-15 Year', '16-20 Year', '20-25 Year', '>25 Year']
-    display_df['Service_Group'] = pd.cut(display_df['Years'], bins=bins, labels=labels, right=False)
-
-    # Calculate tenure distribution by selected breakdown
-    tenure_counts = display_df.groupby([selected_breakdown, 'Service_Group']).size().unstack().fillna(0)
-
-    # Define color map for tenure groups
-    color_map = {
-        '<1 Year': '#1f77b4', '1-3 Year': '#ff7f0e', '4-6 Year': '#2ca02c', '6-10 Year': '#d62728',
-        '11-15 Year': '#9467bd', '16-20 Year': '#8c564b', '20-25 Year': '#e377c2', '>25 Year': '#7f7f7f'
+    # Resolve all filters against the cube; pages sum the 'Count' of the matching cells
+    selections = {
+        'unit': selected_units,
+        'subunit': selected_subunits,
+        'layer': selected_layers,
+        **selected_dimensions,
     }
-
-    # Ensure all tenure groups are present in the data
-    for tenure_group in color_map.keys():
-        if tenure_group not in tenure_counts.columns:
-            tenure_counts[tenure_group] = 0
-
-    # Calculate tenure percentages
-    tenure_percentage = tenure_counts.div(tenure_counts.sum(axis=1), axis=0) * 100
-    tenure_percentage = tenure_percentage.reset_index()
-
-    # Combine count and percentage data for tooltips and text labels
-    tenure_combined = tenure_percentage.melt(id_vars=[selected_breakdown], value_vars=list(color_map.keys()),
-                                             var_name='Tenure Group', value_name='Percentage')
-    tenure_combined = tenure_combined.merge(
-        tenure_counts.reset_index().melt(id_vars=[selected_breakdown], value_vars=list(color_map.keys()),
-                                         var_name='Tenure Group', value_name='Count'),
-        on=[selected_breakdown, 'Tenure Group']
-    )
-    tenure_combined['Label'] = tenure_combined.apply(
-        lambda row: f"{int(row['Count'])} ({row['Percentage']:.1f}%)", axis=1
-    )
-
-    # Display title with filter details
-    title_text = "Tenure Metrics (All Units)" if not selected_units and not selected_subunits and not selected_layers else f"Tenure Metrics (Filtered by {', '.join(selected_units)}, {', '.join(selected_subunits)}, {', '.join(selected_layers)})"
-    st.title(title_text)
-    st.subheader(f"Percentage of Tenure by {selected_breakdown}")
-
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Display total counts and percentages
-    total_counts = tenure_counts.sum().sum()
-    total_percentage = {tenure: (tenure_counts[tenure].sum() / total_counts * 100).round(2) if total_counts > 0 else 0 for tenure in color_map.keys()}
-
-    cols = st.columns(len(color_map.keys()))
-    for i, (tenure, color) in enumerate(color_map.items()):
-        cols[i].markdown(f"""
+    # Only the ids of the matching cells are resolved up front (None = no filter); a page
+    # takes just the columns it aggregates, and only when its results are not cached
+    with profiler.span("filter") as span:
+        matched_rows = cube.index.rows(selections, scope)
+        span['filters'] = sum(1 for values in selections.values() if values)
+        span['scoped'] = scope is not None
+        span['cells'] = len(cube.cells) if matched_rows is None else len(matched_rows)
+
+    # A selected value withheld in its own option list would be given away by any count
+    # of the selection (they all sum to it), so no page shows counts then
+    selection_hidden = bool(MIN_CELL_SIZE) and selection_withheld(
+        lambda column: column_options(column, selections), selections, MIN_CELL_SIZE)
+
+    def filtered(*columns):
+        with profiler.span("filter/take"):
+            return cube.take(matched_rows, columns)
+
+    # Threshold of a count page: under a dimension filter its counts are dimension cells
+    def count_min_cell(page):
+        return page_min_cell(page, selections, MIN_CELL_SIZE)
+
+    # A page's count table without the counts small-cell suppression withholds, and
+    # how many were left out
+    def shown_counts(table, page):
+        table = suppress_counts(table, count_min_cell(page))
+        shown = table[table['Count'].notna()].astype({'Count': 'int64'})
+        return shown, len(table) - len(shown)
+
+    def withheld_caption(withheld):
+        if withheld:
+            st.caption(f"Counts of fewer than {MIN_CELL_SIZE} people are withheld, along with the cells that would reveal them.")
+
+    # Computed page results (tables and figures), shared by every session
+    PAGE_CACHE_MB = float(os.environ.get("EMPLOYEE_PAGE_CACHE_MB", "64"))
+
+    @st.cache_resource
+    def get_page_cache():
+        return MemoCache(max_mb=PAGE_CACHE_MB)
+
+    page_cache = get_page_cache()
+    filter_key = normalize_selections(selections)
+
+    # Look up a page's results by everything they depend on, computing them on a miss
+    def memoized(page, compute, breakdown=selected_breakdown):
+        chart_top_n = top_n if breakdown else None
+        with profiler.span("compute") as span:
+            misses = page_cache.misses
+            result = page_cache.get(snapshot.version, (page, breakdown, chart_top_n, filter_key, as_of, scope_key), compute)
+            span['cache'] = "miss" if page_cache.misses > misses else "hit"
+        return result
+
+    # Render a Plotly chart, timed when profiling
+    def show_chart(fig):
+        with profiler.span("plotly_chart"):
+            st.plotly_chart(fig, use_container_width=True)
+
+    # Total count, per-breakdown counts and chart for the current filters
+    def compute_total_employees_with_breakdown():
+        with profiler.span("aggregate"):
+            cells = filtered(selected_breakdown)
+            total_employees = int(cells['Count'].sum())
+            # A small total under a dimension filter is a dimension cell itself (None = withheld)
+            if 0 < total_employees < count_min_cell('Total'):
+                total_employees = None
+
+            # Group by the selected breakdown and count employees, leaving out withheld counts
+            breakdown_counts, withheld = shown_counts(counts(cells, selected_breakdown), 'Total')
+            breakdown_counts.rename(columns={selected_breakdown: selected_breakdown.capitalize()}, inplace=True)
+
+        with profiler.span("figure"):
+            # Create a horizontal bar chart
+            chart_counts = top_counts(breakdown_counts, top_n, selected_breakdown.capitalize())
+            fig = count_bar(
+                chart_counts[selected_breakdown.capitalize()],
+                chart_counts["Count"],
+                title=f"Employee Distribution by {selected_breakdown.capitalize()}",
+                xaxis_title="Count",
+                yaxis_title=selected_breakdown.capitalize(),
+            )
+
+        return total_employees, breakdown_counts, withheld, fig
+
+    # Display total employee count
+    def display_total_employees_with_breakdown():
+        total_employees, breakdown_counts, withheld, fig = memoized('Total', compute_total_employees_with_breakdown)
+        st.title("Total Employees")
+        st.subheader(f"fewer than {MIN_CELL_SIZE}" if total_employees is None else f"{total_employees:,}")
+        st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
+    
+        # Display the counts in two columns, one markdown block each
+        st.markdown("### Employee Count by Breakdown")
+        withheld_caption(withheld)
+        blocks = count_columns(breakdown_counts[selected_breakdown.capitalize()], breakdown_counts["Count"], 2, thousands=True)
+        for col, block in zip(st.columns(2), blocks):
+            col.markdown(block)
+    
+        # Display the chart
+        show_chart(fig)
+
+    # Aggregates and chart of one dimension page (see DIMENSIONS) for the current filters
+    def compute_dimension_summary(dimension):
+        with profiler.span("aggregate"):
+            # Count and percentage of every category per breakdown value in a single pass
+            table = dimension_crosstab(filtered(selected_breakdown, dimension.column), dimension.page, selected_breakdown,
+                                       MIN_CELL_SIZE)
+
+        with profiler.span("figure"):
+            # Stacked bar chart, with small breakdown values folded into "Other" when top N is set
+            fig = stacked_percentage_bar(
+                table.top(top_n),
+                dimension.categories,
+                dimension.colors,
+                selected_breakdown,
+                legend_title=dimension.legend_title,
+                title=f"{dimension.page} Distribution by {selected_breakdown}",
+            )
+
+        return table, fig
+
+    # Function to display a dimension page
+    def display_dimension_summary(dimension):
+        table, fig = memoized(dimension.page, lambda: compute_dimension_summary(dimension))
+
+        # Display title with filter details
+        title_text = f"{dimension.page} Metrics (All Units)" if not selected_units and not selected_subunits and not selected_layers else f"{dimension.page} Metrics (Filtered by {', '.join(selected_units)}, {', '.join(selected_subunits)}, {', '.join(selected_layers)})"
+        st.title(title_text)
+        st.subheader(f"Percentage of {dimension.page} by {selected_breakdown}")
+        withheld_caption(table.hidden.any() or table.hidden_totals.any())
+
+        st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
+
+        # Display total counts and percentages, with the category's note (e.g. birth years)
+        total_counts = table.grand_total
+        cols = st.columns(len(dimension.categories))
+        for col, category in zip(cols, dimension.categories):
+            count = table.total(category)
+            if count is None:
+                percentage, count = "–", f"fewer than {MIN_CELL_SIZE} or withheld"
+            else:
+                percentage = round(count / total_counts * 100, 2) if total_counts > 0 else 0
+            note = dimension.notes.get(category)
+            note_html = f"<h5 style='margin-top: 0; margin-bottom: 0;'>{note}</h5>" if note else ""
+            col.markdown(f"""
             <div style='text-align: center'>
-                <h5 style="margin-bottom: 0;">{tenure}</h5>
-                <h1><strong>{total_percentage[tenure]}%</strong></h1>
-                <p>{int(tenure_counts[tenure].sum())}</p>
+                <h5 style="margin-bottom: 0;">{category}</h5>
+                {note_html}
+                <h1><strong>{percentage}%</strong></h1>
+                <p>{count}</p>
             </div>
             """, unsafe_allow_html=True)
 
-    st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
-
-    # Plotly stacked bar chart
-    fig = px.bar(
-        tenure_combined,
-        x="Percentage",
-        y=selected_breakdown,
-        color="Tenure Group",
-        orientation="h",
-        text="Label",
-        color_discrete_map=color_map,
-        labels={
-            "Percentage": "Percentage (%)",
-            selected_breakdown: selected_breakdown.capitalize(),
-            "Tenure Group": "Tenure Group"
-        },
-    )
-
-    # Update layout to improve readability
-    fig.update_traces(textposition="inside", insidetextanchor="middle")
-    fig.update_layout(
-        title=f"Tenure Distribution by {selected_breakdown}",
-        xaxis_title="Percentage (%)",
-        yaxis_title=selected_breakdown.capitalize(),
-        bargap=0.2,
-        height=600,
-        width=800,
-        legend_title="Tenure Group"
-    )
-
-    # Display the Plotly chart in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-
-def display_region_summary():
-    # Ensure the region column exists and filter the data
-    if "region" not in df.columns:
-        st.error("The 'region' column is not available in the dataset.")
-        return
-
-    display_df = filtered_df.copy()
-
-    # Group by region and count the employees
-    region_counts = (
-        display_df.groupby("region")
-        .size()
-        .reset_index(name="Count")
-        .sort_values("Count", ascending=False)
-    )
-    region_counts.rename(columns={"region": "Region"}, inplace=True)
-
-    # Display the table in three columns
-    st.markdown("### Employee Count by Region")
-    num_rows = len(region_counts)
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        for i in range(0, num_rows, 3):  # First column: every 3rd item starting from 0
-            if i < num_rows:
-                st.write(f"**{region_counts.iloc[i]['Region']}**: {region_counts.iloc[i]['Count']}")
-
-    with col2:
-        for i in range(1, num_rows, 3):  # Second column: every 3rd item starting from 1
-            if i < num_rows:
-                st.write(f"**{region_counts.iloc[i]['Region']}**: {region_counts.iloc[i]['Count']}")
-
-    with col3:
-        for i in range(2, num_rows, 3):  # Third column: every 3rd item starting from 2
-            if i < num_rows:
-                st.write(f"**{region_counts.iloc[i]['Region']}**: {region_counts.iloc[i]['Count']}")
-
-    # Plotly bar chart for region distribution
-    fig = px.bar(
-        region_counts,
-        x="Count",
-        y="Region",
-        orientation="h",
-        text="Count",
-        color="Region",
-        color_discrete_sequence=px.colors.qualitative.Plotly,
-        labels={"Count": "Employee Count", "Region": "Region"},
-    )
-
-    # Update chart layout
-    fig.update_traces(textposition="outside")
-    fig.update_layout(
-        title="Region-wise Employee Distribution",
-        xaxis_title="Employee Count",
-        yaxis_title="Region",
-        height=600,
-        width=800,
-        showlegend=False,
-    )
-
-    # Display the bar chart in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-
-def display_age_summary():
-    # Ensure the 'Age' column exists
-    if "Age" not in df.columns:
-        st.error("The 'Age' column is not available in the dataset.")
-        return
-
-    # Filter the dataset
-    display_df = filtered_df.copy()
-
-    # Count employees by individual age
-    age_counts = (
-        display_df.groupby("Age")
-        .size()
-        .reset_index(name="Count")
-        .sort_values("Age")
-    )
-
-    # Convert Count to integer for display
-    age_counts["Count"] = age_counts["Count"].astype(int)
-
-    # Split table into columns for better readability
-    st.markdown("### Employee Count by Age")
-    col1, col2, col3 = st.columns(3)
-
-    num_rows = len(age_counts)
-    for i, col in enumerate([col1, col2, col3]):
-        with col:
-            for j in range(i, num_rows, 3):  # Distribute rows across three columns
-                st.write(f"**{int(age_counts.iloc[j]['Age'])}**: {int(age_counts.iloc[j]['Count'])}")
-
-    # Plotly bar chart for individual age distribution
-    fig = px.bar(
-        age_counts,
-        x="Count",
-        y="Age",
-        orientation="h",
-        text="Count",
-        color="Age",
-        color_continuous_scale=px.colors.sequential.Viridis,
-        labels={"Count": "Employee Count", "Age": "Age"},
-    )
-
-    # Update chart layout
-    fig.update_traces(textposition="outside")
-    fig.update_layout(
-        title="Age-wise Employee Distribution",
-        xaxis_title="Employee Count",
-        yaxis_title="Age",
-        height=600,
-        width=800,
-        showlegend=False,
-    )
-
-    # Display the bar chart
-    st.plotly_chart(fig, use_container_width=True)
-
-
-# Main logic to display the selected page's content
-if selected_page == '':
-    display_total_employees_with_breakdown()
-elif selected_page == 'Gender':
-    display_gender_summary()
-elif selected_page == 'Generation':
-    display_generation_summary()
-elif selected_page == 'Religion':
-    display_religion_summary()
-elif selected_page == 'Tenure':
-    display_tenure_summary()
-elif selected_page == 'Region':
-    display_region_summary()
-elif selected_page == 'Age':
-    display_age_summary()
+        st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
+
+        # Display the Plotly chart in Streamlit
+        show_chart(fig)
+
+    # Employees per (breakdown value, `first` value, `second` value) for the current
+    # filters, from one bincount over the cells' codes, suppressed across every
+    # breakdown value and their sum at once
+    def compute_pivot(first, second):
+        with profiler.span("aggregate"):
+            return count_tensor(
+                filtered(selected_breakdown, first.column, second.column),
+                [selected_breakdown, first.column, second.column],
+                [(), first.categories, second.categories],
+                weights='Count',
+            ).suppress(MIN_CELL_SIZE)
+
+    # Function to display the comparison of two dimensions
+    def display_pivot_summary():
+        st.title("Compare Dimensions")
+        st.subheader(f"One dimension against another, by {selected_breakdown}")
+        st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
+        pivot_chart()
+
+    # Re-pivoting (swapping dimensions, picking a breakdown value, changing the
+    # percentages) slices the cached tensor and reruns only this fragment
+    @st.fragment
+    def pivot_chart():
+        names = [dimension.page for dimension in present_dimensions]
+        left, right = st.columns(2)
+        rows = DIMENSION_PAGES[left.selectbox("Rows", names)]
+        columns = DIMENSION_PAGES[right.selectbox("Columns", [name for name in names if name != rows.page])]
+
+        # One tensor per pair of dimensions, whichever way round they are shown
+        first, second = sorted([rows, columns], key=present_dimensions.index)
+        tensor = memoized(f'Compare/{first.page}/{second.page}', lambda: compute_pivot(first, second))
+
+        # Breakdown values with the most employees first; under a dimension filter their
+        # counts are suppressed like the Total page's
+        totals = dict(zip(tensor.axes[0], tensor.counts.sum(axis=(1, 2)).tolist()))
+        values = [None] + sorted(totals, key=totals.get, reverse=True)
+        min_cell = count_min_cell('Compare')
+        hidden_totals = hidden_options(totals, min_cell) if min_cell else set()
+        if 0 < sum(totals.values()) < min_cell:
+            hidden_totals.add(None)
+        left, right = st.columns(2)
+        value = left.selectbox(
+            selected_breakdown.capitalize(),
+            values,
+            format_func=lambda value: (f"{'All' if value is None else value} (withheld)" if value in hidden_totals else
+                                       f"All ({sum(totals.values()):,})" if value is None else f"{value} ({totals[value]:,})"),
+        )
+        over = right.radio("Percentages of", ['all', 'row', 'column'], horizontal=True,
+                           format_func=lambda over: {'all': "All employees", 'row': "Each row", 'column': "Each column"}[over])
+
+        with profiler.span("figure"):
+            counts, hidden = tensor.matrix(value), tensor.hidden_matrix(value)
+            if first is not rows:
+                counts = counts.T
+                hidden = None if hidden is None else (hidden[0].T, hidden[2], hidden[1])
+            percentages, labels = shares(counts, over, hidden)
+            scope_text = f"all {selected_breakdown}s" if value is None else value
+            fig = pivot_heatmap(
+                percentages,
+                labels,
+                tensor.axes[1 if first is rows else 2],
+                tensor.axes[2 if first is rows else 1],
+                row_title=rows.legend_title,
+                column_title=columns.legend_title,
+                title=f"{rows.page} by {columns.page} ({scope_text})",
+            )
+        withheld_caption(MIN_CELL_SIZE and (labels == "").any())
+        show_chart(fig)
+
+    # Region counts and chart for the current filters
+    def compute_region_summary():
+        with profiler.span("aggregate"):
+            # Group by region and count the employees
+            region_counts, withheld = shown_counts(counts(filtered("region"), "region"), 'Region')
+            region_counts.rename(columns={"region": "Region"}, inplace=True)
+
+        with profiler.span("figure"):
+            # Plotly bar chart for region distribution
+            fig = count_bar(
+                region_counts["Region"],
+                region_counts["Count"],
+                title="Region-wise Employee Distribution",
+                xaxis_title="Employee Count",
+                yaxis_title="Region",
+                textposition="outside",
+                colors=cycle_colors(px.colors.qualitative.Plotly, len(region_counts)),
+            )
+
+        return region_counts, withheld, fig
+
+    def display_region_summary():
+        # Ensure the region column exists and filter the data
+        if "region" not in df.columns:
+            st.error("The 'region' column is not available in the dataset.")
+            return
+
+        region_counts, withheld, fig = memoized('Region', compute_region_summary, breakdown=None)
+
+        # Display the table in three columns, every 3rd item per column, one markdown block each
+        st.markdown("### Employee Count by Region")
+        withheld_caption(withheld)
+        blocks = count_columns(region_counts["Region"], region_counts["Count"], 3, layout="stripe")
+        for col, block in zip(st.columns(3), blocks):
+            col.markdown(block)
+
+        # Display the bar chart in Streamlit
+        show_chart(fig)
+
+    # Age counts and chart for the current filters
+    def compute_age_summary():
+        with profiler.span("aggregate"):
+            # Count employees by individual age, leaving out withheld counts
+            age_counts, withheld = shown_counts(counts(filtered("Age"), "Age", sort_by_value=True), 'Age')
+
+        with profiler.span("figure"):
+            # Plotly bar chart for individual age distribution, one trace colored by age
+            fig = count_bar(
+                age_counts["Age"],
+                age_counts["Count"],
+                title="Age-wise Employee Distribution",
+                xaxis_title="Employee Count",
+                yaxis_title="Age",
+                textposition="outside",
+                colorscale=px.colors.sequential.Viridis,
+            )
+
+        return age_counts, withheld, fig
+
+    def display_age_summary():
+        # Ensure the 'Age' column exists
+        if "Age" not in df.columns:
+            st.error("The 'Age' column is not available in the dataset.")
+            return
+
+        age_counts, withheld, fig = memoized('Age', compute_age_summary, breakdown=None)
+
+        # Split table into columns for better readability, one markdown block each
+        st.markdown("### Employee Count by Age")
+        withheld_caption(withheld)
+        blocks = count_columns(age_counts["Age"].astype(int), age_counts["Count"], 3, layout="stripe")
+        for col, block in zip(st.columns(3), blocks):
+            col.markdown(block)
+
+        # Display the bar chart
+        show_chart(fig)
+
+    # Mix of one dimension per breakdown value at every recorded data version, read
+    # from the history with the sidebar filters pushed down to the Parquet scan
+    def compute_trend_summary(page):
+        dimension = DIMENSION_PAGES[page]
+        with profiler.span("aggregate"):
+            trend = shared.history.trend(dimension.column, selected_breakdown, selections, scope=grant)
+
+            # Panels for the largest breakdown values first, limited to top N when set
+            latest = trend[trend['taken'] == trend['taken'].max()]
+            groups = latest.groupby(selected_breakdown, observed=True)['Count'].sum().sort_values(ascending=False).index.tolist()
+            if top_n:
+                groups = groups[:top_n]
+
+            # Every version is its own breakdown x dimension table to suppress
+            trend = suppress_long(trend, selected_breakdown, dimension.column, MIN_CELL_SIZE, by='taken')
+
+        with profiler.span("figure"):
+            fig = trend_lines(
+                trend,
+                dimension.column,
+                dimension.colors,
+                selected_breakdown,
+                groups,
+                legend_title=dimension.legend_title,
+                title=f"{page} Mix over Time by {selected_breakdown}",
+            )
+
+        return trend, fig
+
+    def display_trend_summary():
+        st.title("Trends")
+        if shared.history is None or not shared.history.exists():
+            st.info("No history recorded yet. Each new data version is appended to EMPLOYEE_HISTORY_PATH.")
+            return
+        trend_chart()
+
+
+    # Switching the metric reruns only this fragment, not the sidebar and filter above
+    @st.fragment
+    def trend_chart():
+        page = st.selectbox("Metric", list(DIMENSION_PAGES))
+        trend, fig = memoized(f'Trends/{page}', lambda: compute_trend_summary(page))
+        if trend.empty:
+            st.info("No recorded employees match the current filters.")
+            return
+
+        versions = trend['taken'].nunique()
+        st.subheader(f"Percentage of {page} by {selected_breakdown}")
+        st.caption(f"{versions} data version(s) from {trend['taken'].min():%Y-%m-%d %H:%M} to {trend['taken'].max():%Y-%m-%d %H:%M}")
+
+        st.markdown("<hr style='border:1px solid #000'>", unsafe_allow_html=True)
+
+        show_chart(fig)
+
+
+    # Main logic to display the selected page's content
+    def render_page():
+        # Filter combinations without employees skip the aggregation entirely
+        if matched_rows is not None and len(matched_rows) == 0 and selected_page != 'Trends':
+            st.warning("No employees match the selected filters.")
+        elif selection_hidden:
+            st.warning(f"The selected filters single out a group of fewer than {MIN_CELL_SIZE} people, or one whose "
+                       "count would reveal such a group, so its counts are withheld. Choose broader filters.")
+        elif selected_page == '':
+            display_total_employees_with_breakdown()
+        elif selected_page in DIMENSION_PAGES:
+            display_dimension_summary(DIMENSION_PAGES[selected_page])
+        elif selected_page == 'Compare':
+            display_pivot_summary()
+        elif selected_page == 'Region':
+            display_region_summary()
+        elif selected_page == 'Age':
+            display_age_summary()
+        elif selected_page == 'Trends':
+            display_trend_summary()
+
+    if MEMORY_REPORT:
+        with profiler.span(f"page/{selected_page or 'Total'}", breakdown=selected_breakdown):
+            _, memory = traced(render_page)
+        with st.sidebar.expander("Memory report"):
+            st.write(f"**{selected_page or 'Total'}** page")
+            st.write(f"Peak allocated: {memory.peak / 2**20:,.2f} MB")
+            st.write(f"Still held: {memory.retained / 2**20:,.2f} MB")
+    else:
+        with profiler.span(f"page/{selected_page or 'Total'}", breakdown=selected_breakdown):
+            render_page()
+
+    if profiler.enabled:
+        with st.sidebar.expander("Profile", expanded=False):
+            st.dataframe(pd.DataFrame(profiler.table()), hide_index=True)
+
+    # Cache statistics for maintainers (?admin=1)
+    if st.query_params.get("admin") == "1":
+        with st.sidebar.expander("Admin"):
+            st.write(f"Page cache hits: {page_cache.hits:,}")
+            st.write(f"Page cache misses: {page_cache.misses:,}")
+            st.write(f"Entries: {len(page_cache.entries):,} ({page_cache.size / 2**20:,.2f} of {PAGE_CACHE_MB:g} MB)")
+            stats = shared.stats()
+            st.write(f"Data version: {stats['current'][:12]}, leased by {sum(stats['leases'].values())} rerun(s)")
+finally:
+    profiler.flush()
+    view.release()
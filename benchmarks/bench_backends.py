@@ -0,0 +1,51 @@
+# Check that the duckdb backend returns the same tables as the pandas cube, and time
+# one page query on each (the cube is built once per data version, as in the app).
+#   python -m benchmarks.bench_backends
+import time
+
+import pandas as pd
+
+from benchmarks.bench_filters import SELECTIONS, best_of
+from employee import metrics
+from employee.dimensions import BREAKDOWNS, PAGES
+from employee.normalize import hired, normalize
+from employee.sql import DuckDBBackend
+from employee.synthetic import generate
+
+
+# Same values, order and dtypes up to categorical vs string labels
+def assert_same(expected, actual):
+    labels = [col for col in expected.columns if col not in ('Count', 'Percentage')]
+    pd.testing.assert_frame_equal(
+        expected.astype({col: str for col in labels}),
+        actual.astype({col: str for col in labels}),
+        check_dtype=False,
+        check_exact=True,
+    )
+
+
+def main():
+    selections = {'none': {}, **SELECTIONS}
+    print(f"{'rows':>9} {'build cube':>11} {'build sql':>10} {'page':<11} {'cube':>9} {'duckdb':>9}")
+    for rows in (10_000, 100_000, 1_000_000):
+        raw = generate(rows)
+        start = time.perf_counter()
+        cube = metrics.load_cube(raw)
+        cube_build = time.perf_counter() - start
+        start = time.perf_counter()
+        backend = DuckDBBackend(hired(normalize(raw)))
+        sql_build = time.perf_counter() - start
+
+        for page in PAGES:
+            for breakdown in BREAKDOWNS:
+                for chosen in selections.values():
+                    assert_same(metrics.compute(cube, page, breakdown, chosen), backend.compute(page, breakdown, chosen))
+            chosen = SELECTIONS['one filter']
+            pandas_time = best_of(lambda: metrics.compute(cube, page, 'subunit', chosen))
+            sql_time = best_of(lambda: backend.compute(page, 'subunit', chosen))
+            print(f"{rows:>9,} {cube_build * 1e3:>9.0f}ms {sql_build * 1e3:>8.0f}ms {page:<11} "
+                  f"{pandas_time * 1e3:>7.1f}ms {sql_time * 1e3:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
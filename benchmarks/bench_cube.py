@@ -0,0 +1,79 @@
+# Time a reload as cell deltas applied to the current cube (what CubeMaintainer does
+# for cubes of DELTA_MIN_CELLS cells or more) against building the cube from
+# scratch, for a version with a few rows edited, removed and added, and check that
+# both give the same cube.
+#   python -m benchmarks.bench_cube
+import time
+
+import numpy as np
+import pandas as pd
+
+from employee import metrics
+from employee.cube import DELTA_MIN_CELLS, Cube, cell_deltas, row_hashes
+from employee.dimensions import CUBE_COLUMNS, FILTER_COLUMNS
+from employee.normalize import normalize
+from employee.synthetic import generate
+
+
+# Raw `frame` with `share` of its rows moved to another layer, as many dropped and
+# as many new ones added
+def edited(frame, share, seed=1):
+    rng = np.random.default_rng(seed)
+    changed = max(1, int(len(frame) * share))
+    frame = frame.copy()
+    moved = rng.choice(len(frame), changed, replace=False)
+    frame.iloc[moved, frame.columns.get_loc('layer')] = frame['layer'].iloc[rng.permutation(moved)].to_numpy()
+    kept = frame.drop(frame.index[rng.choice(len(frame), changed, replace=False)])
+    return pd.concat([kept, generate(changed, seed)], ignore_index=True)
+
+
+def keys_of(frame):
+    return frame[[col for col in CUBE_COLUMNS if col in frame.columns]].reset_index(drop=True)
+
+
+def rebuild(frame):
+    keys = keys_of(frame)
+    return Cube.from_keys(keys, row_hashes(keys))
+
+
+def reload(cube, frame):
+    keys = keys_of(frame)
+    return cube.apply(cell_deltas(cube.cells, keys, row_hashes(keys)))
+
+
+# Best time of `fn(*setup())` over `repeat` runs, with its last result
+def best_of(fn, setup, repeat):
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def assert_same(cube, expected):
+    counts = cube.cells['Count'].sort_index()
+    assert counts.index.equals(expected.cells['Count'].sort_index().index)
+    assert (counts == expected.cells['Count'].sort_index()).all()
+    for col in FILTER_COLUMNS:
+        assert cube.options(col, {}) == expected.options(col, {}), col
+    for page in metrics.PAGES:
+        pd.testing.assert_frame_equal(metrics.compute(cube, page, 'subunit'), metrics.compute(expected, page, 'subunit'))
+
+
+def main(sizes=(10_000, 50_000, 100_000, 1_000_000), share=0.01, repeat=3):
+    print(f"{'rows':>9} {'cells':>9} {'rebuild':>9} {'delta':>9}  maintainer")
+    for rows in sizes:
+        raw = generate(rows)
+        old, new = normalize(raw), normalize(edited(raw, share))
+        rebuild_time, expected = best_of(rebuild, lambda: (new,), repeat)
+        # A fresh old cube per run, so lookups into its cells are not warmed up
+        delta_time, cube = best_of(reload, lambda: (rebuild(old), new), repeat)
+        assert_same(cube, expected)
+        path = "delta" if len(rebuild(old).cells) >= DELTA_MIN_CELLS else "rebuild"
+        print(f"{rows:>9,} {len(cube.cells):>9,} {rebuild_time * 1e3:>7.0f}ms {delta_time * 1e3:>7.0f}ms  {path}")
+
+
+if __name__ == "__main__":
+    main()
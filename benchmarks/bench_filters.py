@@ -0,0 +1,63 @@
+# Compare the chained `isin` filter against the FilterIndex.
+#   python -m benchmarks.bench_filters
+import time
+
+from employee.dimensions import FILTER_COLUMNS
+from employee.index import FilterIndex
+from employee.normalize import normalize
+from employee.synthetic import generate
+
+
+def make_frame(rows, seed=0):
+    return normalize(generate(rows, seed))
+
+
+# The filter chain app.py used before the index
+def chained_filter(frame, selections):
+    filtered = frame.copy()
+    for col, values in selections.items():
+        if values:
+            filtered = filtered[filtered[col].isin(values)]
+    return filtered
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+SELECTIONS = {
+    'one filter': {'unit': ['Unit 01', 'Unit 02']},
+    'all filters': {
+        'unit': ['Unit 01', 'Unit 02', 'Unit 03'],
+        'subunit': sorted(set(generate(5_000)['subunit']))[::3],
+        'layer': ['4', '5', 'N-A'],
+        'gender': ['Female'],
+        'generation': ['GEN Y', 'GEN Z'],
+        'Religious Denomination Key': ['Islam', 'Kristen'],
+        'Service_Group': ['1-3 Year', '4-6 Year', '6-10 Year'],
+    },
+}
+
+
+def main():
+    print(f"{'rows':>9} {'selection':<12} {'build':>9} {'chain':>9} {'index':>9} {'speedup':>8}")
+    for rows in (10_000, 100_000, 1_000_000):
+        frame = make_frame(rows)
+        start = time.perf_counter()
+        index = FilterIndex(frame, FILTER_COLUMNS)
+        build = time.perf_counter() - start
+        for name, selections in SELECTIONS.items():
+            assert index.select(frame, selections).index.equals(chained_filter(frame, selections).index)
+            chain = best_of(lambda: chained_filter(frame, selections))
+            indexed = best_of(lambda: index.select(frame, selections))
+            print(f"{rows:>9,} {name:<12} {build * 1e3:>7.1f}ms {chain * 1e3:>7.1f}ms "
+                  f"{indexed * 1e3:>7.1f}ms {chain / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
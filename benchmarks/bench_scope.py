@@ -0,0 +1,26 @@
+# Time what per-user scoping (employee.access) adds to resolving the sidebar filters
+# on each rerun. That scoped results never include out-of-scope rows is checked in
+# tests/test_access.py.
+#   python -m benchmarks.bench_scope
+from benchmarks.bench_filters import best_of
+from employee import metrics
+from employee.access import scope_mask
+from employee.synthetic import generate
+
+
+def main():
+    cube = metrics.load_cube(generate(100_000))
+    units = sorted(map(str, cube.options('unit', {})))
+    subunits = sorted(map(str, cube.options('subunit', {})))
+
+    grant = {'unit': units[:2], 'subunit': subunits[:3]}
+    scope = scope_mask(cube.index, grant)
+    print(f"{'selections':<12} {'unscoped':>9} {'scoped':>9}")
+    for name, selections in [('none', {}), ('one filter', {'layer': ['3']}), ('two filters', {'layer': ['3'], 'gender': ['Female']})]:
+        plain = best_of(lambda: cube.index.rows(selections))
+        scoped = best_of(lambda: cube.index.rows(selections, scope))
+        print(f"{name:<12} {plain * 1e3:>7.2f}ms {scoped * 1e3:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Simulate concurrent dashboard sessions against one process and report memory and
+# rerun latency:
+#   python -m benchmarks.load_test --rows 100000 --sessions 1 10 50 --reruns 20
+# "shared" leases one frame and cube for every session (what app.py does);
+# "isolated" gives each session its own copy, as before the shared store.
+import argparse
+import random
+import threading
+import time
+
+import numpy as np
+
+from employee import metrics
+from employee.dimensions import BREAKDOWNS, CUBE_COLUMNS
+from employee.normalize import normalize
+from employee.shared import SharedStore
+from employee.snapshot import SnapshotStore
+from employee.synthetic import generate
+
+
+# In-memory stand-in for the sheet; `copy` hands every read a fresh frame
+class FrameSource:
+    def __init__(self, frame, copy=False):
+        self.frame = frame
+        self.copy = copy
+
+    def read(self):
+        return self.frame.copy() if self.copy else self.frame
+
+    def marker(self):
+        return None
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+# One session: a few reruns with random pages, breakdowns and filters
+def session(shared, reruns, seed, latencies):
+    rng = random.Random(seed)
+    for _ in range(reruns):
+        start = time.perf_counter()
+        view = shared.acquire()
+        try:
+            units = sorted(view.cube.index.columns['unit'].lookup)
+            selections = {'unit': rng.sample(units, rng.randint(0, 3)), 'gender': rng.choice([[], ['Female']])}
+            metrics.compute(view.cube, rng.choice(metrics.PAGES), rng.choice(BREAKDOWNS), selections)
+        finally:
+            view.release()
+        latencies.append(time.perf_counter() - start)
+
+
+def run(frame, sessions, reruns, isolated):
+    if isolated:
+        stores = [SharedStore(SnapshotStore(FrameSource(frame, copy=True), prepare=normalize), CUBE_COLUMNS)
+                  for _ in range(sessions)]
+    else:
+        stores = [SharedStore(SnapshotStore(FrameSource(frame), prepare=normalize), CUBE_COLUMNS)] * sessions
+    latencies = []
+    threads = [threading.Thread(target=session, args=(store, reruns, i, latencies)) for i, store in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.percentile(latencies, 50) * 1e3, np.percentile(latencies, 95) * 1e3, rss_mb()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--mode", choices=["shared", "isolated"], default="shared")
+    args = parser.parse_args(argv)
+
+    frame = generate(args.rows)
+    print(f"{args.mode}, {args.rows:,} rows; baseline RSS {rss_mb():,.0f} MB")
+    print(f"{'sessions':>8} {'p50 ms':>8} {'p95 ms':>8} {'RSS MB':>8}")
+    for sessions in args.sessions:
+        p50, p95, rss = run(frame, sessions, args.reruns, args.mode == "isolated")
+        print(f"{sessions:>8} {p50:>8.1f} {p95:>8.1f} {rss:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
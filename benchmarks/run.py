@@ -0,0 +1,142 @@
+# Time every stage of the dashboard pipeline on synthetic data and write JSON results
+# for regression tracking:
+#   python -m benchmarks.run --rows 1000 10000 100000 1000000 --output bench.json
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.express as px
+
+from employee import columnar, metrics
+from employee.cube import Cube, row_hashes
+from employee.derive import binned
+from employee.dimensions import BREAKDOWNS, COUNT_PAGES, CUBE_COLUMNS, DIMENSION_PAGES, TENURE_BINS, TENURE_LABELS
+from employee.figures import count_bar, cycle_colors, stacked_percentage_bar
+from employee.normalize import normalize
+from employee.snapshot import fingerprint
+from employee.sources import ColumnarSource, CsvSource
+from employee.synthetic import generate
+
+# A realistic sidebar selection: two units, one gender, three tenure groups
+SELECTION = {
+    'unit': ['Unit 01', 'Unit 02'],
+    'gender': ['Female'],
+    'Service_Group': ['1-3 Year', '4-6 Year', '6-10 Year'],
+}
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+# The isin chain app.py used before the cube, kept as a reference point
+def legacy_filter(frame, selections):
+    filtered = frame.copy()
+    for col, values in selections.items():
+        if values:
+            filtered = filtered[filtered[col].isin(values)]
+    return filtered
+
+
+def page_figure(cells, page, breakdown):
+    if page in DIMENSION_PAGES:
+        dimension = DIMENSION_PAGES[page]
+        table = metrics.dimension_crosstab(cells, page, breakdown)
+        return stacked_percentage_bar(table, dimension.categories, dimension.colors, breakdown, dimension.legend_title, page)
+    column = COUNT_PAGES.get(page, breakdown)
+    table = metrics.counts(cells, column, sort_by_value=column == 'Age')
+    if column == 'Age':
+        return count_bar(table[column], table['Count'], page, "Count", column, colorscale=px.colors.sequential.Viridis)
+    return count_bar(table[column], table['Count'], page, "Count", column,
+                     colors=cycle_colors(px.colors.qualitative.Plotly, len(table)))
+
+
+def run(rows, repeat, workdir):
+    results = {}
+
+    def stage(name, fn):
+        seconds, result = best_of(fn, repeat)
+        results[name] = seconds
+        return result
+
+    raw = generate(rows)
+    csv_path = os.path.join(workdir, f"employees-{rows}.csv")
+    arrow_path = os.path.join(workdir, f"employees-{rows}.arrow")
+    raw.to_csv(csv_path, index=False)
+    columnar.write(raw, arrow_path)
+
+    frame = stage("load/csv", CsvSource(csv_path).read)
+    stage("load/arrow", ColumnarSource(arrow_path).read)
+    stage("load/fingerprint", lambda: fingerprint(frame))
+    stage("normalize/tenure_binning", lambda: binned(frame['Years'], TENURE_BINS, TENURE_LABELS))
+    frame = stage("normalize/all", lambda: normalize(frame))
+    keys = frame[CUBE_COLUMNS].reset_index(drop=True)
+    cube = stage("cube/build", lambda: Cube.from_keys(keys, row_hashes(keys)))
+    stage("filter/legacy_isin_chain", lambda: legacy_filter(frame, SELECTION))
+    stage("filter/cube_select_all", lambda: cube.select({}))
+    cells = stage("filter/cube_select", lambda: cube.select(SELECTION))
+
+    for page in metrics.PAGES:
+        breakdowns = BREAKDOWNS if page not in COUNT_PAGES else [None]
+        for breakdown in breakdowns:
+            suffix = f"{page}" if breakdown is None else f"{page}/{breakdown}"
+            stage(f"aggregate/{suffix}", lambda: metrics.page_table(cells, page, breakdown or 'unit'))
+            fig = stage(f"figure/{suffix}", lambda: page_figure(cells, page, breakdown))
+            stage(f"serialize/{suffix}", lambda: plotly.io.to_json(fig, validate=False))
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipeline on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON results file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "plotly": plotly.__version__,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            print(f"{rows:,} rows...", file=sys.stderr)
+            report["results"][str(rows)] = run(rows, args.repeat, workdir)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as out:
+            out.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Data layer for the KG DEI dashboard (app.py).
@@ -0,0 +1,3 @@
+from employee.cli import main
+
+main()
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+
+from employee.memo import normalize_selections
+
+# Row-level access for the dashboard: the units and subunits each user may see,
+# from a JSON mapping file (EMPLOYEE_ACCESS_PATH):
+#
+#   {
+#     "hr-lead@kompasgramedia.com": "*",
+#     "editor@kompasgramedia.com": {"unit": ["KGMedia"], "subunit": ["Kompas TV"]},
+#     "*": {"unit": ["KGEdu"]}
+#   }
+#
+# A user sees every row of the units and of the subunits they are granted, or all
+# rows for "*". The "*" user is the grant of anyone not listed, signed-out visitors
+# included; without it they see nothing.
+
+EVERYTHING = '*'
+SCOPE_COLUMNS = ['unit', 'subunit']
+
+
+# {user: grant}, with users lowercased and a grant either EVERYTHING or {column: [values]}
+def load_grants(path):
+    with open(path, encoding='utf-8') as handle:
+        mapping = json.load(handle)
+    grants = {}
+    for user, grant in mapping.items():
+        if grant != EVERYTHING:
+            if not isinstance(grant, dict) or set(grant) - set(SCOPE_COLUMNS):
+                raise ValueError(f"Access for {user!r} must be \"*\" or an object with {' and/or '.join(SCOPE_COLUMNS)} lists")
+            # A bare string would otherwise be read as a list of its characters
+            for col, values in grant.items():
+                if not isinstance(values, list):
+                    raise ValueError(f"Access for {user!r}: {col} must be a list of values, got {values!r}")
+            grant = {col: [str(value) for value in values] for col, values in grant.items() if values}
+        grants[user.strip().lower()] = grant
+    return grants
+
+
+def grant_for(grants, user):
+    return grants.get((user or '').strip().lower(), grants.get(EVERYTHING, {}))
+
+
+# Hashable form of a grant, for cache keys shared by users with the same access
+def grant_key(grant):
+    return EVERYTHING if grant == EVERYTHING else normalize_selections(grant)
+
+
+# Boolean mask of the rows of a FilterIndex visible under `grant` (None = all rows).
+# Built once per data version and grant; a rerun only ANDs it with its filters.
+def scope_mask(index, grant):
+    if grant == EVERYTHING:
+        return None
+    mask = np.zeros(index.size, dtype=bool)
+    for col, values in grant.items():
+        if col in index.columns:
+            codes = index.columns[col].value_codes(values)
+            if codes:
+                mask[index.columns[col].rows(codes)] = True
+    return mask
@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+
+from employee import metrics
+from employee.dimensions import BREAKDOWNS, FILTER_NAMES, PAGES, SOURCE_COLUMNS
+from employee.normalize import hired, normalize
+from employee.sources import local_source
+
+
+# Print one page's table for the given filters:
+#   python -m employee --source employees.arrow --page Gender --breakdown subunit \
+#       --filter unit=KGMedia --filter tenure="1-3 Year" --format csv
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m employee", description="Compute KG DEI dashboard tables.")
+    parser.add_argument("--source", default=os.environ.get("EMPLOYEE_DATA_PATH"),
+                        help="CSV, Parquet or Arrow employee file (default: $EMPLOYEE_DATA_PATH)")
+    parser.add_argument("--page", choices=PAGES, default="Total")
+    parser.add_argument("--breakdown", choices=BREAKDOWNS, default="unit")
+    parser.add_argument("--filter", action="append", default=[], metavar="NAME=VALUE",
+                        help=f"Repeatable; NAME is one of {', '.join(FILTER_NAMES)}; VALUE may be comma-separated")
+    parser.add_argument("--format", choices=metrics.FORMATS, default="csv")
+    parser.add_argument("--output", help="Write to this file instead of stdout")
+    parser.add_argument("--backend", choices=metrics.BACKENDS, default=os.environ.get("EMPLOYEE_BACKEND", "pandas"),
+                        help="duckdb runs the page as one SQL query (needs the duckdb package)")
+    parser.add_argument("--min-cell", type=int, default=int(os.environ.get("EMPLOYEE_MIN_CELL_SIZE", "0")),
+                        help="Suppress dimension counts, and any counts under a dimension filter, of fewer people than this (default: $EMPLOYEE_MIN_CELL_SIZE, 0 = off)")
+    args = parser.parse_args(argv)
+
+    if not args.source:
+        parser.error("--source is required when EMPLOYEE_DATA_PATH is not set")
+    try:
+        selections = metrics.parse_filters(item.split("=", 1) for item in args.filter)
+    except ValueError as error:
+        parser.error(str(error))
+
+    frame = local_source(args.source, SOURCE_COLUMNS).read()
+    if args.backend == 'duckdb':
+        from employee.sql import DuckDBBackend
+        table = DuckDBBackend(hired(normalize(frame))).compute(args.page, args.breakdown, selections, args.min_cell)
+    else:
+        table = metrics.compute(metrics.load_cube(frame), args.page, args.breakdown, selections, args.min_cell)
+    payload = metrics.serialize(table, args.format)
+    if args.output:
+        with open(args.output, "wb") as out:
+            out.write(payload)
+    else:
+        sys.stdout.buffer.write(payload)
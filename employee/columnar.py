@@ -0,0 +1,62 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from employee.dimensions import DIMENSIONS, SORTED_CATEGORIES
+from employee.normalize import as_text
+
+# Low-cardinality columns stored dictionary-encoded (pandas categoricals on read);
+# binned dimensions are derived on load from their numeric source instead
+CATEGORICAL_COLUMNS = SORTED_CATEGORIES + [dimension.column for dimension in DIMENSIONS if dimension.bins is None]
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+
+
+def is_columnar_path(path):
+    return str(path).lower().endswith(PARQUET_SUFFIXES + ARROW_SUFFIXES)
+
+
+# Type the raw sheet export: categoricals of text for the dimension columns (numeric
+# labels included), numbers for the rest
+def prepare(frame):
+    frame = frame.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in frame.columns:
+            frame[col] = as_text(frame[col])
+    # Same placeholder the dashboard uses, so the category set already contains it
+    if 'layer' in frame.columns:
+        frame['layer'] = frame['layer'].fillna("N-A")
+    for col in CATEGORICAL_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].astype('category')
+    for col in ('Years', 'Age'):
+        if col in frame.columns:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce')
+    return frame
+
+
+def write(frame, path):
+    table = pa.Table.from_pandas(prepare(frame), preserve_index=False)
+    if str(path).lower().endswith(PARQUET_SUFFIXES):
+        pq.write_table(table, path)
+    else:
+        # Uncompressed IPC so the file can be memory-mapped without decoding
+        feather.write_feather(table, path, compression='uncompressed')
+
+
+# Open the file memory-mapped; dictionary columns come back as pandas categoricals.
+# With `columns`, only those of them present in the file are read.
+def read(path, columns=None):
+    if str(path).lower().endswith(PARQUET_SUFFIXES):
+        if columns is not None:
+            names = set(pq.read_schema(path).names)
+            columns = [col for col in columns if col in names]
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([col for col in columns if col in table.column_names])
+    return table.to_pandas()
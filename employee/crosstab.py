@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+from employee.suppress import hidden_cells, hidden_slices
+
+
+# Counts of one dimension per breakdown value, with row percentages and totals
+class Crosstab:
+    def __init__(self, index, columns, counts):
+        self.index = index        # breakdown values (rows)
+        self.columns = columns    # dimension values (columns)
+        self.counts = counts      # int64 matrix, len(index) x len(columns)
+        self.row_totals = counts.sum(axis=1)
+        self.column_totals = counts.sum(axis=0)
+        self.grand_total = int(self.row_totals.sum())
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.percentages = counts / self.row_totals[:, None] * 100
+        # Cells and column totals withheld by suppress()
+        self.min_cell = 0
+        self.hidden = np.zeros(counts.shape, dtype=bool)
+        self.hidden_totals = np.zeros(len(columns), dtype=bool)
+
+    # Column total, or None when it is suppressed
+    def total(self, column):
+        i = self.columns.index(column)
+        return None if self.hidden_totals[i] else int(self.column_totals[i])
+
+    # Copy with counts under `min_cell` people and their complements hidden
+    # (employee.suppress); `hidden` cells are hidden whatever their count
+    def suppress(self, min_cell, hidden=None):
+        if not min_cell:
+            return self
+        table = Crosstab(self.index, self.columns, self.counts)
+        table.min_cell = min_cell
+        table.hidden, table.hidden_totals = hidden_cells(self.counts, min_cell, hidden)
+        table.percentages = np.where(table.hidden, np.nan, table.percentages)
+        return table
+
+    # Counts safe to publish: hidden cells read 0
+    def shown_counts(self):
+        return np.where(self.hidden, 0, self.counts)
+
+    # Keep the `n` breakdown values with the most people (in their original order)
+    # and fold the rest into one `other` row
+    def top(self, n, other="Other"):
+        if not n or len(self.index) <= n:
+            return self
+        order = np.argsort(-self.row_totals, kind='stable')
+        keep = np.sort(order[:n])
+        counts = np.vstack([self.counts[keep], self.counts[order[n:]].sum(axis=0, keepdims=True)])
+        table = Crosstab(np.append(self.index[keep], other), self.columns, counts)
+        # A folded sum that includes a hidden cell stays hidden
+        hidden = np.vstack([self.hidden[keep], self.hidden[order[n:]].any(axis=0, keepdims=True)])
+        return table.suppress(self.min_cell, hidden)
+
+    # Long format for the stacked bar charts: one row per (column, breakdown value),
+    # grouped by column, with a "count (pct%)" label built without a per-row apply
+    def long(self, breakdown, dimension, columns=None):
+        columns = self.columns if columns is None else columns
+        positions = [self.columns.index(col) for col in columns]
+        counts = self.counts[:, positions].T.ravel()
+        percentages = self.percentages[:, positions].T.ravel()
+        hidden = self.hidden[:, positions].T.ravel()
+        labels = np.char.add(np.char.add(counts.astype(str), " ("), np.char.mod("%.1f%%)", percentages))
+        return pd.DataFrame({
+            breakdown: np.tile(self.index, len(positions)),
+            dimension: np.repeat(np.asarray(columns, dtype=object), len(self.index)),
+            'Percentage': percentages,
+            'Count': pd.Series(counts, dtype='Int64').mask(hidden).array if self.min_cell else counts,
+            'Label': np.where(hidden, "", labels),
+        })
+
+
+# Percentages of a 2-D count matrix over all its cells ('all'), within each row
+# ('row') or within each column ('column'), and "count (pct%)" labels. `hidden`
+# holds the masks of suppressed cells, column totals and row totals (as from
+# CountTensor.hidden_matrix): a hidden cell has no label, and a row or column whose
+# total is hidden has no percentages.
+def shares(counts, over='all', hidden=None):
+    if hidden is None:
+        hidden = (np.zeros(counts.shape, dtype=bool), np.zeros(counts.shape[1], dtype=bool), np.zeros(counts.shape[0], dtype=bool))
+    hidden, hidden_columns, hidden_rows = hidden
+    if over == 'row':
+        totals, blank = counts.sum(axis=1, keepdims=True), hidden_rows[:, None]
+    elif over == 'column':
+        totals, blank = counts.sum(axis=0, keepdims=True), hidden_columns[None, :]
+    else:
+        totals, blank = counts.sum(), False
+    with np.errstate(invalid='ignore', divide='ignore'):
+        percentages = np.where(hidden | blank, np.nan, counts / totals * 100)
+    text = counts.astype(str)
+    labels = np.where(np.isnan(percentages), text, np.char.add(np.char.add(text, " ("), np.char.mod("%.1f%%)", percentages)))
+    return percentages, np.where(hidden, "", labels)
+
+
+# Integer codes of `series` over its values, `categories` first in the given order
+# followed by any other observed values; missing values get -1
+def _codes(series, categories=()):
+    value_codes, values = pd.factorize(series, sort=True)
+    columns = list(categories)
+    listed = set(columns)
+    columns += [value for value in values if value not in listed]
+    position = {value: i for i, value in enumerate(columns)}
+    remap = np.array([position[value] for value in values] + [-1], dtype=np.int64)
+    # Missing values have code -1, which picks the trailing -1 of `remap`
+    return remap[value_codes], columns
+
+
+# Count `dimension` per `breakdown` value in one bincount over integer codes.
+# `categories` come first in the given order, followed by any other observed values.
+# Missing keys are dropped, as groupby does. With `weights`, each row counts as
+# that column's value (e.g. the 'Count' of a cube cell) instead of 1.
+def crosstab(frame, breakdown, dimension, categories=(), weights=None):
+    table = count_tensor(frame, [breakdown, dimension], [(), categories], weights)
+    return Crosstab(np.asarray(table.axes[0], dtype=object), table.axes[1], table.counts)
+
+
+# Counts over several columns at once: counts[i, j, ...] is the number of rows (or
+# their `weights`) with the i-th value of columns[0], the j-th of columns[1], ...
+class CountTensor:
+    def __init__(self, axes, counts):
+        self.axes = axes        # values of each column, in axis order
+        self.counts = counts    # int64 array, one axis per column
+        # Masks of hidden cells, column totals and row totals per matrix, set by suppress()
+        self.hidden = None
+
+    # 2-D counts of the last two columns for one value of the first (None = all of them)
+    def matrix(self, value=None):
+        if value is None:
+            return self.counts.sum(axis=0)
+        return self.counts[self.axes[0].index(value)]
+
+    # Copy of a 3-D tensor with small counts hidden in all of its matrices at once
+    # (employee.suppress.hidden_slices), so no matrix gives away another's
+    def suppress(self, min_cell):
+        table = CountTensor(self.axes, self.counts)
+        if min_cell:
+            table.hidden = hidden_slices(self.counts, min_cell)
+        return table
+
+    # Masks of hidden cells, column totals and row totals of matrix(value), or None
+    def hidden_matrix(self, value=None):
+        if self.hidden is None:
+            return None
+        i = -1 if value is None else self.axes[0].index(value)
+        return tuple(mask[i] for mask in self.hidden)
+
+
+# CountTensor of `columns` from one bincount over their combined integer codes, each
+# column's `categories` listed first. Rows missing any key are dropped, and so are
+# values of the first column without any counted row.
+def count_tensor(frame, columns, categories=None, weights=None):
+    codes, axes = [], []
+    first_codes, first_values = pd.factorize(frame[columns[0]], sort=True)
+    codes.append(first_codes.astype(np.int64))
+    axes.append(list(first_values))
+    for column, listed in zip(columns[1:], (categories or [()] * len(columns))[1:]):
+        column_codes, values = _codes(frame[column], listed)
+        codes.append(column_codes)
+        axes.append(values)
+
+    shape = tuple(len(values) for values in axes)
+    valid = np.logical_and.reduce([column_codes >= 0 for column_codes in codes])
+    flat = np.ravel_multi_index(tuple(column_codes[valid] for column_codes in codes), shape)
+    row_weights = None if weights is None else frame[weights].to_numpy()[valid]
+    counts = np.bincount(flat, weights=row_weights, minlength=int(np.prod(shape)))
+    counts = counts.astype(np.int64).reshape(shape)
+
+    keep = counts.sum(axis=tuple(range(1, counts.ndim))) > 0
+    axes[0] = [value for value, kept in zip(axes[0], keep) if kept]
+    return CountTensor(axes, counts[keep])
+
+
+# Same as Crosstab.top for a count table sorted by 'Count', descending
+def top_counts(counts, n, label_column, other="Other"):
+    if not n or len(counts) <= n:
+        return counts
+    rest = pd.DataFrame({label_column: [other], 'Count': [counts['Count'].iloc[n:].sum()]})
+    return pd.concat([counts.iloc[:n], rest], ignore_index=True)
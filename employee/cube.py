@@ -0,0 +1,130 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from employee.dimensions import CATEGORY_ORDERS
+from employee.index import FilterIndex
+
+
+# One 64-bit hash per row of the key columns; equal rows hash equal
+def row_hashes(keys):
+    return pd.util.hash_pandas_object(keys, index=False).values
+
+
+# Group rows into cells: one row per distinct key combination, indexed by its hash,
+# with the number of rows in 'Count'. `counts` may be signed (row deltas).
+def _cells(keys, hashes, counts):
+    first = ~pd.Series(hashes).duplicated().values
+    cells = keys.iloc[first].copy()
+    cells.index = pd.Index(hashes[first], name='key')
+    cells['Count'] = counts.reindex(cells.index).astype('int64').values
+    return cells
+
+
+# Signed cell counts turning `cells` (a cube's) into the cells of the rows `keys`:
+# the rows are counted per hash and diffed against the cells' counts. Keys of new
+# cells come from their first row, the others from `cells`.
+def cell_deltas(cells, keys, hashes):
+    counts = pd.Series(hashes).value_counts()
+    position = cells.index.get_indexer(counts.index)
+    existing = position >= 0
+    # Cells with rows in both, cells left without rows, and new cells
+    diff = np.zeros(len(cells), dtype=np.int64)
+    diff[position[existing]] = counts.to_numpy()[existing]
+    diff -= cells['Count'].to_numpy()
+    changed = cells.iloc[np.flatnonzero(diff)].copy()
+    changed['Count'] = diff[diff != 0]
+    added = counts[~existing]
+    rows = pd.Series(hashes).isin(added.index).to_numpy() if len(added) else np.zeros(len(hashes), dtype=bool)
+    return pd.concat([changed, _cells(keys.iloc[rows], hashes[rows], added)])
+
+
+# Categorical dtypes `added` cells need to concatenate with `cells`: both sets of
+# categories, ordered as normalize orders them (CATEGORY_ORDERS first, then by text)
+def _merged_dtypes(cells, added, columns):
+    dtypes = {}
+    for col in columns:
+        dtype = cells[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and added[col].dtype != dtype:
+            values = added[col].dtype.categories if isinstance(added[col].dtype, pd.CategoricalDtype) else added[col].dropna().unique()
+            order = list(CATEGORY_ORDERS.get(col, ()))
+            extra = sorted(set(dtype.categories).union(values).difference(order), key=str)
+            dtypes[col] = pd.CategoricalDtype(order + extra, dtype.ordered)
+    return dtypes
+
+
+# Employee counts for every combination of the cube columns. Pages filter the
+# cells and sum 'Count' instead of scanning employee rows.
+class Cube:
+    def __init__(self, cells, columns, index=None):
+        self.cells = cells
+        self.columns = columns
+        self.index = FilterIndex(cells, columns) if index is None else index
+        self.weights = cells['Count'].to_numpy()
+
+    @classmethod
+    def from_keys(cls, keys, hashes):
+        return cls(_cells(keys, hashes, pd.Series(hashes).value_counts()), list(keys.columns))
+
+    # Cells matching the sidebar selections ({column: [values]})
+    def select(self, selections):
+        return self.index.select(self.cells, selections)
+
+    # Only `columns` (plus 'Count') of the cells at `rows` (None = all cells)
+    def take(self, rows, columns):
+        cells = self.cells[list(columns) + ['Count']]
+        return cells if rows is None else cells.take(rows)
+
+    # Employees per value of `column` that co-occur with the other columns' selections
+    def options(self, column, selections, scope=None):
+        return self.index.options(column, selections, weights=self.weights, scope=scope)
+
+    # New cube with signed cell deltas added; emptied cells are dropped. The filter
+    # index is updated rather than rebuilt: kept cells keep their order and new
+    # cells are appended.
+    def apply(self, delta):
+        position = self.cells.index.get_indexer(delta.index)
+        existing = position >= 0
+        counts = self.cells['Count'].to_numpy().copy()
+        counts[position[existing]] += delta['Count'].to_numpy()[existing]
+        kept = counts > 0
+        added = delta[~existing]
+        # Categoricals with differing categories would concatenate to strings; extend
+        # them instead, keeping the existing order
+        dtypes = _merged_dtypes(self.cells, added, self.columns)
+        cells = self.cells[kept].astype(dtypes)
+        cells['Count'] = counts[kept]
+        cells = pd.concat([cells, added.astype(dtypes)])
+        return Cube(cells, self.columns, self.index.updated(cells, kept))
+
+
+# Keeps the cube in step with the snapshot version. A new version is applied as
+# cell deltas against the current cube unless most cells changed; only the cube is
+# kept between versions, not the previous rows. Cubes smaller than DELTA_MIN_CELLS
+# are rebuilt, which is faster there (python -m benchmarks.bench_cube).
+DELTA_MIN_CELLS = 50_000
+
+
+class CubeMaintainer:
+    def __init__(self, columns):
+        self.columns = columns
+        self.lock = threading.Lock()
+        self.version = None
+        self.cube = None
+
+    def update(self, version, frame):
+        with self.lock:
+            if version == self.version:
+                return self.cube
+            keys = frame[[col for col in self.columns if col in frame.columns]].reset_index(drop=True)
+            hashes = row_hashes(keys)
+            cube = None
+            if self.cube is not None and len(self.cube.cells) >= DELTA_MIN_CELLS and list(keys.columns) == self.cube.columns:
+                delta = cell_deltas(self.cube.cells, keys, hashes)
+                if len(delta) <= len(self.cube.cells) // 2:
+                    cube = self.cube.apply(delta)
+            if cube is None:
+                cube = Cube.from_keys(keys, hashes)
+            self.version, self.cube = version, cube
+            return cube
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from employee.dimensions import BIRTH_DATE, GENERATION_YEARS, HIRE_DATE
+
+# Age, generation and tenure derived from birth and hire dates as of a reference
+# day, for the whole frame at once in NumPy. Sheets with these date columns get
+# their 'Age', 'generation' and 'Years' columns recomputed instead of trusted.
+
+
+def has_dates(frame):
+    return BIRTH_DATE in frame.columns or HIRE_DATE in frame.columns
+
+
+# Day-resolution datetime64 array; unparseable or missing dates become NaT
+def parse_dates(series):
+    return pd.to_datetime(series, errors='coerce').to_numpy(dtype='datetime64[D]')
+
+
+# Month and day of each date as one sortable number (month * 32 + day)
+def _month_day(dates):
+    months = dates.astype('datetime64[M]')
+    return (months - dates.astype('datetime64[Y]')).astype(np.int64) * 32 + (dates - months).astype(np.int64)
+
+
+# Completed years from each date to `as_of` (float, NaN where the date is missing)
+def whole_years(dates, as_of):
+    as_of = np.datetime64(as_of, 'D')
+    years = (as_of.astype('datetime64[Y]') - dates.astype('datetime64[Y]')).astype(np.int64)
+    # One less before this year's anniversary
+    years = years - (_month_day(dates) > _month_day(np.array([as_of]))[0])
+    return np.where(np.isnat(dates), np.nan, years)
+
+
+# Generation of each birth date from GENERATION_YEARS; None outside every range
+def generations(birth_dates):
+    names = list(GENERATION_YEARS)
+    starts = np.array([start for start, _ in GENERATION_YEARS.values()])
+    ends = np.array([end for _, end in GENERATION_YEARS.values()])
+    years = birth_dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    codes = np.searchsorted(starts, years, side='right') - 1
+    valid = ~np.isnat(birth_dates) & (codes >= 0) & (years <= ends[np.clip(codes, 0, None)])
+    return pd.Categorical.from_codes(np.where(valid, codes, -1), categories=names)
+
+
+# Label of the left-closed bin each value falls in (missing outside every bin)
+def binned(values, bins, labels):
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.searchsorted(bins, values, side='right') - 1
+    valid = ~np.isnan(values) & (codes >= 0) & (codes < len(labels))
+    return pd.Categorical.from_codes(np.where(valid, codes, -1), categories=labels)
+
+
+# Columns to replace on `frame` as of `as_of` (a date): parsed date columns plus
+# 'Age' and 'generation' from the birth date and 'Years' from the hire date. Also
+# returns a mask of the employees already hired on that day.
+def derive(frame, as_of):
+    columns = {}
+    employed = np.ones(len(frame), dtype=bool)
+    if BIRTH_DATE in frame.columns:
+        births = parse_dates(frame[BIRTH_DATE])
+        columns[BIRTH_DATE] = births
+        columns['Age'] = whole_years(births, as_of)
+        columns['generation'] = generations(births)
+    if HIRE_DATE in frame.columns:
+        hires = parse_dates(frame[HIRE_DATE])
+        columns[HIRE_DATE] = hires
+        columns['Years'] = whole_years(hires, as_of)
+        # Employees hired after the reference day are not counted yet
+        employed = np.isnat(hires) | (hires <= np.datetime64(as_of, 'D'))
+    return columns, employed
@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+
+# Tenure groups for 'Years' (left-closed bins)
+TENURE_BINS = [-1, 1, 3, 6, 10, 15, 20, 25, float('inf')]
+TENURE_LABELS = ['<1 Year', '1-3 Year', '4-6 Year', '6-10 Year', '11-15 Year', '16-20 Year', '20-25 Year', '>25 Year']
+
+# Define color map for gender
+GENDER_COLORS = {'Male': '#90d5ff', 'Female': '#ffb5c0'}
+
+# Define color map for generations
+GENERATION_COLORS = {
+    'POST WAR': '#9467bd',  # Purple
+    'BOOMERS': '#1f77b4',  # Blue
+    'GEN X': '#ff7f0e',    # Orange
+    'GEN Y': '#2ca02c',    # Green
+    'GEN Z': '#d62728'     # Red
+}
+
+# Birth years (first, last) of each generation, as shown on the Generation page
+GENERATION_YEARS = {
+    'POST WAR': (1928, 1945),
+    'BOOMERS': (1946, 1964),
+    'GEN X': (1965, 1980),
+    'GEN Y': (1981, 1996),
+    'GEN Z': (1997, 2012),
+}
+
+# Define color map for religions
+RELIGION_COLORS = {
+    'Islam': '#1f77b4',       # Blue
+    'Kristen': '#ff7f0e',     # Orange
+    'Katholik': '#2ca02c',    # Green
+    'Hindu': '#d62728',       # Red
+    'Buddha': '#9467bd',      # Purple
+    'Kepercayaan': '#8c564b', # Brown
+    'Kong Hu Cu': '#e377c2'   # Pink
+}
+
+# Define color map for tenure groups
+TENURE_COLORS = dict(zip(TENURE_LABELS, [
+    '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f',
+]))
+
+# An employee attribute shown as percentages per breakdown value on its own page,
+# filterable in the sidebar, the CLI and the HTTP endpoint. `colors` lists every
+# category in chart order. A dimension with `bins` is computed from the numeric
+# `source` column: left-closed bins, one per color. `notes` are shown under a
+# category's name on the page.
+@dataclass(frozen=True)
+class Dimension:
+    page: str
+    column: str
+    legend_title: str
+    colors: dict
+    filter_name: str
+    source: str = None
+    bins: list = None
+    notes: dict = field(default_factory=dict)
+
+    @property
+    def categories(self):
+        return list(self.colors)
+
+
+# Adding a metric page is one entry here (the sheet needs the column, or its source)
+DIMENSIONS = [
+    Dimension('Gender', 'gender', 'Gender', GENDER_COLORS, filter_name='gender'),
+    Dimension('Generation', 'generation', 'Generation', GENERATION_COLORS, filter_name='generation',
+              notes={name: f"({first}-{last})" for name, (first, last) in GENERATION_YEARS.items()}),
+    Dimension('Religion', 'Religious Denomination Key', 'Religion', RELIGION_COLORS, filter_name='religion'),
+    Dimension('Tenure', 'Service_Group', 'Tenure Group', TENURE_COLORS, filter_name='tenure',
+              source='Years', bins=TENURE_BINS),
+]
+DIMENSION_PAGES = {dimension.page: dimension for dimension in DIMENSIONS}
+
+# Columns the sidebar filters on; the cube also keeps age and region
+DIMENSION_COLUMNS = [dimension.column for dimension in DIMENSIONS]
+FILTER_COLUMNS = ['unit', 'subunit', 'layer'] + DIMENSION_COLUMNS
+CUBE_COLUMNS = FILTER_COLUMNS + ['Age', 'region']
+
+BREAKDOWNS = ['unit', 'subunit', 'layer']
+
+# Short filter names accepted by the CLI and HTTP endpoint
+FILTER_NAMES = {
+    'unit': 'unit',
+    'subunit': 'subunit',
+    'layer': 'layer',
+    **{dimension.filter_name: dimension.column for dimension in DIMENSIONS},
+}
+
+# Fixed category order of each dimension column (the chart order); values
+# outside these lists are kept after them
+CATEGORY_ORDERS = {dimension.column: dimension.categories for dimension in DIMENSIONS}
+
+# Optional birth and hire dates that age, generation and tenure are derived from
+BIRTH_DATE = 'Birth Date'
+HIRE_DATE = 'Hire Date'
+
+# Sheet columns the dashboard reads; sources drop every other column on load
+SOURCE_COLUMNS = list(dict.fromkeys(
+    ['unit', 'subunit', 'layer', 'region', 'Age', 'Years', BIRTH_DATE, HIRE_DATE]
+    + [dimension.source or dimension.column for dimension in DIMENSIONS]
+))
+
+# Other dimension columns, with their categories in sorted order
+SORTED_CATEGORIES = ['unit', 'subunit', 'layer', 'region']
+
+# Pages counting employees per value of one column, ignoring the breakdown
+COUNT_PAGES = {'Region': 'region', 'Age': 'Age'}
+
+PAGES = ['Total'] + list(DIMENSION_PAGES) + list(COUNT_PAGES)
@@ -0,0 +1,246 @@
+import argparse
+import importlib.util
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from employee import metrics
+from employee.dimensions import BREAKDOWNS, COUNT_PAGES, DIMENSION_PAGES, PAGES, SOURCE_COLUMNS
+from employee.figures import count_bar, cycle_colors, stacked_percentage_bar
+from employee.sources import local_source
+from employee.suppress import page_min_cell
+
+# Monthly HR bundle: every page x breakdown table for all units and for each unit on
+# its own, plus one chart per table, in a single run:
+#
+#   python -m employee.export --source employees.arrow --output reports/2024-06 \
+#       --formats csv,parquet,xlsx --charts png,svg --workers 4
+#
+# The source is read once and every table comes from the same cube the dashboard
+# uses. Tables are streamed into one long table per format as they are computed;
+# charts are rendered by a process pool while the next tables are being computed.
+
+TABLE_FORMATS = ['csv', 'parquet', 'xlsx']
+CHART_FORMATS = ['png', 'svg', 'html']
+
+ALL_UNITS = 'All Units'
+
+# One schema for every page, so the tables stream into a single file per format
+EXPORT_SCHEMA = pa.schema([
+    ('Scope', pa.string()),
+    ('Page', pa.string()),
+    ('Breakdown', pa.string()),
+    ('Breakdown Value', pa.string()),
+    ('Value', pa.string()),
+    ('Count', pa.int64()),
+    ('Percentage', pa.float64()),
+])
+
+
+# (scope, page, breakdown) of every table. Count pages ignore the breakdown, and a
+# single unit is not broken down by unit.
+def export_jobs(units):
+    for scope in [ALL_UNITS] + list(units):
+        for page in PAGES:
+            if page in COUNT_PAGES:
+                yield scope, page, None
+                continue
+            for breakdown in BREAKDOWNS:
+                if scope == ALL_UNITS or breakdown != 'unit':
+                    yield scope, page, breakdown
+
+
+# A page table in the shared export schema
+def long_table(table, scope, page, breakdown):
+    if page in DIMENSION_PAGES:
+        breakdown_values, values = table[breakdown], table[DIMENSION_PAGES[page].legend_title]
+    elif page == 'Total':
+        breakdown_values, values = table[breakdown], None
+    else:
+        breakdown_values, values = None, table[COUNT_PAGES[page]]
+    return pd.DataFrame({
+        'Scope': scope,
+        'Page': page,
+        'Breakdown': breakdown,
+        'Breakdown Value': None if breakdown_values is None else breakdown_values.astype(str),
+        'Value': None if values is None else values.astype(str),
+        'Count': table['Count'].astype('Int64'),
+        'Percentage': table['Percentage'].astype('float64'),
+    }, index=table.index)
+
+
+# The dashboard chart for one table
+def page_figure(cells, table, scope, page, breakdown, min_cell=0):
+    if page in DIMENSION_PAGES:
+        dimension = DIMENSION_PAGES[page]
+        return stacked_percentage_bar(
+            metrics.dimension_crosstab(cells, page, breakdown, min_cell),
+            dimension.categories,
+            dimension.colors,
+            breakdown,
+            legend_title=dimension.legend_title,
+            title=f"{page} Distribution by {breakdown} ({scope})",
+        )
+    if page == 'Total':
+        return count_bar(
+            table[breakdown],
+            table['Count'],
+            title=f"Employee Distribution by {breakdown.capitalize()} ({scope})",
+            xaxis_title="Count",
+            yaxis_title=breakdown.capitalize(),
+        )
+    column = COUNT_PAGES[page]
+    if column == 'Age':
+        return count_bar(table[column], table['Count'], title=f"Age-wise Employee Distribution ({scope})",
+                         xaxis_title="Employee Count", yaxis_title="Age", textposition="outside",
+                         colorscale=px.colors.sequential.Viridis)
+    return count_bar(table[column], table['Count'], title=f"{page}-wise Employee Distribution ({scope})",
+                     xaxis_title="Employee Count", yaxis_title=page, textposition="outside",
+                     colors=cycle_colors(px.colors.qualitative.Plotly, len(table)))
+
+
+# Appends tables to one file per format as they arrive
+class TableWriter:
+    def __init__(self, output, formats):
+        self.csv = None
+        self.parquet = None
+        self.workbook = None
+        self.sheets = {}
+        if 'csv' in formats:
+            self.csv = open(os.path.join(output, "tables.csv"), "w", newline="", encoding="utf-8")
+            self.csv.write(",".join(EXPORT_SCHEMA.names) + "\n")
+        if 'parquet' in formats:
+            self.parquet = pq.ParquetWriter(os.path.join(output, "tables.parquet"), EXPORT_SCHEMA)
+        if 'xlsx' in formats:
+            from openpyxl import Workbook
+            # Write-only workbooks flush rows as they are appended
+            self.workbook = Workbook(write_only=True)
+            self.xlsx_path = os.path.join(output, "tables.xlsx")
+
+    def write(self, frame):
+        if self.csv is not None:
+            frame.to_csv(self.csv, header=False, index=False)
+        if self.parquet is not None:
+            self.parquet.write_table(pa.Table.from_pandas(frame, schema=EXPORT_SCHEMA, preserve_index=False))
+        if self.workbook is not None:
+            # One sheet per page
+            page = frame['Page'].iloc[0] if len(frame) else None
+            if page is not None:
+                if page not in self.sheets:
+                    self.sheets[page] = self.workbook.create_sheet(page)
+                    self.sheets[page].append(EXPORT_SCHEMA.names)
+                for row in frame.itertuples(index=False):
+                    self.sheets[page].append([None if pd.isna(value) else value for value in row])
+
+    def close(self):
+        if self.csv is not None:
+            self.csv.close()
+        if self.parquet is not None:
+            self.parquet.close()
+        if self.workbook is not None:
+            self.workbook.save(self.xlsx_path)
+
+
+def slug(text):
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', str(text)).strip('_')
+
+
+# Runs in a worker process: write one figure (as Plotly JSON) in every chart format
+def render_chart(path, figure_json, formats):
+    fig = pio.from_json(figure_json)
+    for fmt in formats:
+        if fmt == 'html':
+            fig.write_html(f"{path}.html", include_plotlyjs='cdn')
+        else:
+            fig.write_image(f"{path}.{fmt}")
+    return path
+
+
+# Write the whole bundle to `output`, with dimension cells of fewer than `min_cell`
+# people suppressed. Returns the number of tables and charts written.
+def export(frame, output, formats=('csv',), charts=(), workers=None, min_cell=0):
+    os.makedirs(output, exist_ok=True)
+    cube = metrics.load_cube(frame)
+    units = [str(unit) for unit in cube.options('unit', {})]
+    writer = TableWriter(output, formats)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    pool = ProcessPoolExecutor(max_workers=workers) if charts and workers > 0 else None
+    # Bound the figures waiting for a worker so memory stays flat on large exports
+    pending = deque()
+    tables = rendered = 0
+    try:
+        for scope, page, breakdown in export_jobs(units):
+            selections = {} if scope == ALL_UNITS else {'unit': [scope]}
+            cells = cube.select(selections)
+            table = metrics.page_table(cells, page, breakdown or 'unit', page_min_cell(page, selections, min_cell))
+            writer.write(long_table(table, scope, page, breakdown))
+            tables += 1
+            if not charts:
+                continue
+            folder = os.path.join(output, "charts", slug(scope))
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, slug(f"{page}_{breakdown}" if breakdown else page))
+            figure_json = page_figure(cells, table, scope, page, breakdown, min_cell).to_json()
+            if pool is None:
+                render_chart(path, figure_json, charts)
+                rendered += 1
+                continue
+            pending.append(pool.submit(render_chart, path, figure_json, charts))
+            if len(pending) >= 4 * workers:
+                pending.popleft().result()
+                rendered += 1
+        while pending:
+            pending.popleft().result()
+            rendered += 1
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return tables, rendered
+
+
+def _formats(value, choices):
+    formats = [part.strip() for part in value.split(',') if part.strip()]
+    unknown = [fmt for fmt in formats if fmt not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown format {', '.join(unknown)}; expected {', '.join(choices)}")
+    return formats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m employee.export",
+                                     description="Export every KG DEI dashboard table and chart for all units.")
+    parser.add_argument("--source", default=os.environ.get("EMPLOYEE_DATA_PATH"),
+                        help="CSV, Parquet or Arrow employee file (default: $EMPLOYEE_DATA_PATH)")
+    parser.add_argument("--output", required=True, help="Directory for the bundle")
+    parser.add_argument("--formats", type=lambda value: _formats(value, TABLE_FORMATS), default=['csv'],
+                        help=f"Comma-separated table formats: {', '.join(TABLE_FORMATS)}")
+    parser.add_argument("--charts", type=lambda value: _formats(value, CHART_FORMATS), default=[],
+                        help=f"Comma-separated chart formats: {', '.join(CHART_FORMATS)} (png/svg need kaleido)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Chart rendering processes (default: one per CPU, 0 = render inline)")
+    parser.add_argument("--min-cell", type=int, default=int(os.environ.get("EMPLOYEE_MIN_CELL_SIZE", "0")),
+                        help="Suppress dimension counts of fewer people than this (default: $EMPLOYEE_MIN_CELL_SIZE, 0 = off)")
+    args = parser.parse_args(argv)
+
+    if not args.source:
+        parser.error("--source is required when EMPLOYEE_DATA_PATH is not set")
+    if 'xlsx' in args.formats and importlib.util.find_spec("openpyxl") is None:
+        parser.error("xlsx output needs the openpyxl package")
+    if {'png', 'svg'} & set(args.charts) and importlib.util.find_spec("kaleido") is None:
+        parser.error("png/svg charts need the kaleido package")
+
+    frame = local_source(args.source, SOURCE_COLUMNS).read()
+    tables, charts = export(frame, args.output, args.formats, args.charts, args.workers, args.min_cell)
+    print(f"Wrote {tables} tables and {charts} charts to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# Figures built with graph_objects for a small serialized payload: numeric arrays go
+# out as typed arrays (float32/int32) instead of JSON number lists, bar labels come
+# from a texttemplate instead of one preformatted string per bar, and stacked charts
+# put bars at integer positions labelled by tick text (the names also go out as hover
+# text, the only readable label with hundreds of subunits).
+
+
+def _category_axis(labels):
+    return dict(tickmode='array', tickvals=np.arange(len(labels), dtype=np.int32), ticktext=[str(label) for label in labels])
+
+
+# Stacked horizontal percentage bars: one trace per dimension value, one bar per breakdown value
+def stacked_percentage_bar(table, columns, colors, breakdown, legend_title, title):
+    positions = np.arange(len(table.index), dtype=np.int32)
+    # Bars sit at integer positions, so the hover names the breakdown value itself
+    names = [str(value) for value in table.index]
+    fig = go.Figure()
+    for column in columns:
+        i = table.columns.index(column)
+        fig.add_trace(go.Bar(
+            name=str(column),
+            x=table.percentages[:, i].astype(np.float32),
+            y=positions,
+            customdata=table.shown_counts()[:, i].astype(np.int32),
+            orientation='h',
+            marker_color=colors.get(column),
+            texttemplate="%{customdata} (%{x:.1f}%)",
+            textposition="inside",
+            insidetextanchor="middle",
+            hovertext=names,
+            hovertemplate=f"{breakdown}=%{{hovertext}}<br>{legend_title}={column}<br>"
+                          f"Percentage (%)=%{{x:.1f}}<br>Count=%{{customdata}}<extra></extra>",
+        ))
+    fig.update_layout(
+        barmode='stack',
+        title=title,
+        xaxis_title="Percentage (%)",
+        yaxis_title=breakdown.capitalize(),
+        yaxis=_category_axis(table.index),
+        bargap=0.2,
+        height=600,
+        width=800,
+        legend_title=legend_title,
+    )
+    return fig
+
+
+# Single-trace horizontal count bars. `colors` (one per bar) or `colorscale` (colored
+# by the numeric labels) replace the one-trace-per-category that px.bar emits.
+def count_bar(labels, counts, title, xaxis_title, yaxis_title, textposition="inside",
+              colors=None, colorscale=None):
+    counts = np.asarray(counts, dtype=np.int32)
+    numeric = colorscale is not None
+    y = np.asarray(labels, dtype=np.int32) if numeric else [str(label) for label in labels]
+    marker = dict(color=y, colorscale=colorscale) if numeric else dict(color=colors)
+    fig = go.Figure(go.Bar(
+        x=counts,
+        y=y,
+        orientation='h',
+        text=counts,
+        textposition=textposition,
+        marker=marker,
+        hovertemplate=f"{yaxis_title}=%{{y}}<br>{xaxis_title}=%{{x}}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title=yaxis_title,
+        yaxis_type='linear' if numeric else 'category',
+        bargap=0.2,
+        height=600,
+        width=800,
+        showlegend=False,
+    )
+    return fig
+
+
+# Share of each dimension value over time: one small panel per breakdown value in
+# `groups`, one line per value in `colors`, the legend shown once
+def trend_lines(trend, column, colors, breakdown, groups, legend_title, title, panels_per_row=3):
+    rows = max(1, -(-len(groups) // panels_per_row))
+    fig = make_subplots(
+        rows=rows,
+        cols=panels_per_row,
+        subplot_titles=[str(group) for group in groups],
+        shared_xaxes=True,
+        shared_yaxes=True,
+        vertical_spacing=0.3 / rows,
+    )
+    lines_by_key = dict(iter(trend.groupby([breakdown, column], observed=True, sort=False)))
+    shown = set()
+    for i, group in enumerate(groups):
+        for value, color in colors.items():
+            lines = lines_by_key.get((group, value))
+            if lines is None:
+                continue
+            fig.add_trace(go.Scatter(
+                x=lines['taken'],
+                y=lines['Percentage'].to_numpy(dtype=np.float32),
+                customdata=lines['Count'].to_numpy(dtype=np.float32, na_value=np.nan),
+                mode='lines+markers',
+                name=str(value),
+                legendgroup=str(value),
+                showlegend=value not in shown,
+                line=dict(color=color),
+                hovertemplate=f"%{{x|%Y-%m-%d %H:%M}}<br>{value}: %{{y:.1f}}% (%{{customdata:,}})<extra>{group}</extra>",
+            ), row=i // panels_per_row + 1, col=i % panels_per_row + 1)
+            shown.add(value)
+    fig.update_yaxes(range=[0, 100], ticksuffix='%')
+    fig.update_layout(
+        title=title,
+        legend_title=legend_title,
+        height=220 * rows + 160,
+        width=900,
+    )
+    return fig
+
+
+# Heatmap of one dimension against another, colored by `percentages` and labelled
+# with `labels` (one per cell); missing percentages are left blank
+def pivot_heatmap(percentages, labels, rows, columns, row_title, column_title, title):
+    fig = go.Figure(go.Heatmap(
+        z=np.asarray(percentages, dtype=np.float32),
+        x=[str(column) for column in columns],
+        y=[str(row) for row in rows],
+        text=labels,
+        texttemplate="%{text}",
+        colorscale='Blues',
+        zmin=0,
+        colorbar=dict(title="%", ticksuffix='%'),
+        hovertemplate=f"{row_title}=%{{y}}<br>{column_title}=%{{x}}<br>%{{text}}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=column_title,
+        yaxis_title=row_title,
+        xaxis_type='category',
+        yaxis=dict(type='category', autorange='reversed'),
+        height=max(400, 60 * len(rows) + 200),
+        width=800,
+    )
+    return fig
+
+
+# Palette colors repeated to cover `n` bars
+def cycle_colors(palette, n):
+    return [palette[i % len(palette)] for i in range(n)]
@@ -0,0 +1,121 @@
+import os
+import threading
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from employee.access import EVERYTHING
+from employee.dimensions import FILTER_COLUMNS
+
+# Append-only history of employee counts, one Parquet partition per data version:
+#
+#   <root>/taken=<epoch seconds>/<version>.parquet
+#
+# A partition holds only the cells (filter column combinations) whose count changed
+# since the previous version, as signed deltas; the first one holds every cell.
+# Unchanged rows are never written again, and the count of a cell at time t is the
+# sum of its deltas up to t. Trend queries push the sidebar filters and the columns
+# they need down to the Parquet scan instead of loading every snapshot.
+
+
+# Stored key of cells missing a value (e.g. no tenure group), like a missing layer
+MISSING = "N-A"
+
+
+# Text keys of `columns`, missing values as MISSING, so cells line up across versions
+def _keys(frame, columns):
+    return pd.DataFrame({col: frame[col].astype(object).where(frame[col].notna(), MISSING).astype(str) for col in columns})
+
+
+# Dataset filter for sidebar selections ({column: [values]}) on the stored columns
+def _predicate(selections, names):
+    predicate = None
+    for col, values in (selections or {}).items():
+        if not values or col not in names:
+            continue
+        condition = ds.field(col).isin([str(value) for value in values])
+        predicate = condition if predicate is None else predicate & condition
+    return predicate
+
+
+# Dataset filter for a user's access grant (employee.access): rows of any granted
+# unit or subunit; None for everything
+def _scope_predicate(grant, names):
+    if grant is None or grant == EVERYTHING:
+        return None
+    predicate = ds.scalar(False)
+    for col, values in grant.items():
+        if values and col in names:
+            predicate = predicate | ds.field(col).isin([str(value) for value in values])
+    return predicate
+
+
+class HistoryStore:
+    def __init__(self, root, columns=FILTER_COLUMNS):
+        self.root = root
+        self.columns = columns
+        self.lock = threading.Lock()
+        self.counts = None      # latest count per cell, a Series indexed by the columns
+
+    def _dataset(self):
+        return ds.dataset(self.root, format="parquet", partitioning="hive")
+
+    def exists(self):
+        return os.path.isdir(self.root) and any(name.startswith("taken=") for name in os.listdir(self.root))
+
+    # Current count per cell, summed from the stored deltas on first use
+    # (None while the history is empty)
+    def _latest(self, columns):
+        if self.counts is None and self.exists():
+            frame = self._dataset().to_table(columns=columns + ['Count']).to_pandas()
+            counts = _keys(frame, columns).assign(Count=frame['Count'].to_numpy()).groupby(columns)['Count'].sum()
+            self.counts = counts[counts != 0]
+        return self.counts
+
+    # Append the cells of a new data version taken at `taken_at` (epoch seconds).
+    # Returns the number of changed cells written (0 when nothing changed).
+    def record(self, version, taken_at, cells):
+        columns = [col for col in self.columns if col in cells.columns]
+        counts = _keys(cells, columns).assign(Count=cells['Count'].to_numpy()).groupby(columns)['Count'].sum()
+        with self.lock:
+            previous = self._latest(columns)
+            delta = counts if previous is None else counts.sub(previous, fill_value=0)
+            delta = delta[delta != 0].astype('int64')
+            if delta.empty:
+                return 0
+            partition = os.path.join(self.root, f"taken={int(taken_at)}")
+            os.makedirs(partition, exist_ok=True)
+            delta.reset_index().to_parquet(os.path.join(partition, f"{version[:16]}.parquet"), index=False)
+            self.counts = counts[counts != 0]
+            return len(delta)
+
+    # Employees per `dimension` value (and per `breakdown` value) at every stored
+    # version matching the selections, with each value's share of its breakdown
+    # group: columns taken, [breakdown], dimension, Count, Percentage. Only cells
+    # inside the `scope` grant are read. Cells missing the dimension are left out,
+    # as on the dimension pages, so shares (and suppression) match theirs.
+    def trend(self, dimension, breakdown=None, selections=None, scope=None):
+        keys = [col for col in (breakdown, dimension) if col]
+        if not self.exists():
+            return pd.DataFrame(columns=['taken'] + keys + ['Count', 'Percentage'])
+        dataset = self._dataset()
+        names = dataset.schema.names
+        predicate = _predicate(selections, names)
+        scoped = _scope_predicate(scope, names)
+        if scoped is not None:
+            predicate = scoped if predicate is None else predicate & scoped
+        known = ds.field(dimension) != MISSING
+        predicate = known if predicate is None else predicate & known
+        table = dataset.to_table(columns=['taken'] + keys + ['Count'], filter=predicate)
+        deltas = table.to_pandas().groupby(keys + ['taken'])['Count'].sum()
+        if deltas.empty:
+            return pd.DataFrame(columns=['taken'] + keys + ['Count', 'Percentage'])
+
+        # Count at each version = running sum of the cell's deltas over time
+        running = deltas.unstack('taken', fill_value=0).sort_index(axis=1).cumsum(axis=1)
+        result = running.stack().rename('Count').reset_index()
+        groups = ['taken'] + keys[:-1]
+        totals = result.groupby(groups)['Count'].transform('sum')
+        result['Percentage'] = (result['Count'] / totals.where(totals > 0) * 100).fillna(0.0)
+        result['taken'] = pd.to_datetime(result['taken'], unit='s')
+        return result[['taken'] + keys + ['Count', 'Percentage']].sort_values(['taken'] + keys, ignore_index=True)
@@ -0,0 +1,83 @@
+import argparse
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from employee import metrics
+from employee.dimensions import CUBE_COLUMNS, SOURCE_COLUMNS
+from employee.normalize import normalize
+from employee.shared import SharedStore
+from employee.snapshot import SnapshotStore
+from employee.sources import local_source
+from employee.sql import backend_for
+
+# Lightweight JSON/CSV/Arrow endpoint over the dashboard tables:
+#   python -m employee.http --source employees.arrow --port 8600
+#   GET /metrics?page=Gender&breakdown=subunit&unit=KGMedia&tenure=1-3%20Year&format=json
+# Every query parameter other than page, breakdown and format is a filter.
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    shared = None
+    backend = 'pandas'
+    min_cell = 0
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/metrics":
+            self.send_error(404)
+            return
+        params = parse_qsl(url.query)
+        options = {name: value for name, value in params if name in ("page", "breakdown", "format")}
+        fmt = options.get("format", "json")
+        try:
+            selections = metrics.parse_filters((name, value) for name, value in params if name not in options)
+            view = self.shared.acquire()
+            try:
+                page, breakdown = options.get("page", "Total"), options.get("breakdown", "unit")
+                if self.backend == 'duckdb':
+                    table = backend_for(view.snapshot).compute(page, breakdown, selections, self.min_cell)
+                else:
+                    table = metrics.compute(view.cube, page, breakdown, selections, self.min_cell)
+            finally:
+                view.release()
+            payload = metrics.serialize(table, fmt)
+        except ValueError as error:
+            self.send_error(400, str(error))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", metrics.CONTENT_TYPES[fmt])
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-Data-Version", view.version)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def serve(source, host="127.0.0.1", port=8600, ttl=600, backend='pandas', min_cell=0):
+    MetricsHandler.shared = SharedStore(SnapshotStore(source, ttl=ttl, prepare=normalize), CUBE_COLUMNS)
+    MetricsHandler.backend = backend
+    # Set by whoever runs the server, never by a query parameter
+    MetricsHandler.min_cell = min_cell
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    print(f"Serving /metrics on http://{host}:{port}")
+    server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve KG DEI dashboard tables over HTTP.")
+    parser.add_argument("--source", default=os.environ.get("EMPLOYEE_DATA_PATH"),
+                        help="CSV, Parquet or Arrow employee file (default: $EMPLOYEE_DATA_PATH)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--ttl", type=int, default=int(os.environ.get("EMPLOYEE_DATA_TTL", "600")))
+    parser.add_argument("--backend", choices=metrics.BACKENDS, default=os.environ.get("EMPLOYEE_BACKEND", "pandas"))
+    parser.add_argument("--min-cell", type=int, default=int(os.environ.get("EMPLOYEE_MIN_CELL_SIZE", "0")),
+                        help="Suppress dimension counts, and any counts under a dimension filter, of fewer people than this (0 = off)")
+    args = parser.parse_args(argv)
+    if not args.source:
+        parser.error("--source is required when EMPLOYEE_DATA_PATH is not set")
+    serve(local_source(args.source, SOURCE_COLUMNS), args.host, args.port, args.ttl, args.backend, args.min_cell)
+
+
+if __name__ == "__main__":
+    main()
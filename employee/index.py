@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+
+# Row ids of every value of one column, grouped by value (CSR layout):
+# rows with value `k` are row_ids[offsets[k]:offsets[k + 1]]
+class ColumnIndex:
+    def __init__(self, series):
+        codes, uniques = pd.factorize(series)
+        codes = codes.astype(np.int32)
+        self._build(series, list(uniques), codes, np.argsort(codes, kind='stable').astype(np.int32))
+
+    def _build(self, series, values, codes, row_ids):
+        self.codes = codes
+        self.values = values
+        # Display order of the codes: category order for categoricals, else by text
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            position = {value: i for i, value in enumerate(series.cat.categories)}
+            self.order = sorted(range(len(values)), key=lambda code: position[values[code]])
+        else:
+            self.order = sorted(range(len(values)), key=lambda code: str(values[code]))
+        self.lookup = {value: code for code, value in enumerate(values)}
+        # Text form of each value, for selections parsed from the CLI or a URL
+        self.text_lookup = {str(value): code for code, value in enumerate(values)}
+        # Missing values get code -1 and sort first; they never match a selection
+        self.row_ids = row_ids
+        self.offsets = np.cumsum(np.bincount(codes + 1, minlength=len(values) + 1))
+
+    # Index of `series`: the rows of this index where `kept` is set, in order,
+    # followed by new rows. The kept rows stay grouped as they were, so only the
+    # new rows are sorted. Matches a fresh index of `series`, except that values
+    # left without rows keep their (empty) code.
+    def updated(self, series, kept):
+        size = int(kept.sum())
+        new_codes, new_values = pd.factorize(series.iloc[size:])
+        values, lookup = list(self.values), dict(self.lookup)
+        for value in new_values:
+            if value not in lookup:
+                lookup[value] = len(values)
+                values.append(value)
+        remap = np.array([lookup[value] for value in new_values] + [-1], dtype=np.int32)
+        codes = np.concatenate([self.codes[kept], remap[new_codes]])
+
+        # Kept rows at their new positions, still grouped by code (missing first)
+        row_ids = self.row_ids
+        if size < len(kept):
+            row_ids = row_ids[kept[row_ids]]
+            row_ids = row_ids - (np.cumsum(~kept, dtype=np.int32))[row_ids]
+        # Each new row goes after the kept rows of its code
+        new = np.argsort(codes[size:], kind='stable').astype(np.int32)
+        ends = np.cumsum(np.bincount(codes[:size] + 1, minlength=len(values) + 1))
+        row_ids = np.insert(row_ids, ends[codes[size:][new] + 1], size + new)
+
+        index = ColumnIndex.__new__(ColumnIndex)
+        index._build(series, values, codes, row_ids)
+        return index
+
+    def value_codes(self, values):
+        codes = []
+        for value in values:
+            code = self.lookup.get(value, self.text_lookup.get(str(value)))
+            if code is not None:
+                codes.append(code)
+        return codes
+
+    def count(self, codes):
+        return int(sum(self.offsets[code + 1] - self.offsets[code] for code in codes))
+
+    def rows(self, codes):
+        return np.concatenate([self.row_ids[self.offsets[code]:self.offsets[code + 1]] for code in codes])
+
+
+# Built once per data load. A selection {column: [values]} is resolved by taking
+# the row ids of the most selective column and narrowing them with the codes of
+# the other columns, so only the final row set is materialized.
+class FilterIndex:
+    def __init__(self, frame, columns):
+        self.size = len(frame)
+        self.columns = {col: ColumnIndex(frame[col]) for col in columns if col in frame.columns}
+
+    # Index of `frame`: the rows of this index where `kept` is set, followed by new
+    # rows (see ColumnIndex.updated)
+    def updated(self, frame, kept):
+        index = FilterIndex.__new__(FilterIndex)
+        index.size = len(frame)
+        index.columns = {col: column.updated(frame[col], kept) for col, column in self.columns.items()}
+        return index
+
+    # Sorted row positions matching the selection, or None when nothing is selected.
+    # `scope` (a boolean mask of the rows a user may see, see employee.access)
+    # narrows the result; nothing outside it is ever returned.
+    def rows(self, selections, scope=None):
+        active = []
+        for col, values in selections.items():
+            if values and col in self.columns:
+                index = self.columns[col]
+                codes = index.value_codes(values)
+                if not codes:
+                    return np.empty(0, dtype=np.int32)
+                active.append((index.count(codes), index, codes))
+        if not active:
+            return None if scope is None else np.flatnonzero(scope).astype(np.int32)
+
+        active.sort(key=lambda item: item[0])
+        _, index, codes = active[0]
+        rows = index.rows(codes)
+        for _, index, codes in active[1:]:
+            allowed = np.zeros(len(index.lookup) + 1, dtype=bool)
+            allowed[codes] = True
+            # Code -1 (missing) lands on the extra last slot, which stays False
+            rows = rows[allowed[index.codes[rows]]]
+        if scope is not None:
+            rows = rows[scope[rows]]
+        rows.sort()
+        return rows
+
+    # {value: weighted row count} of `column` over the rows matching every *other*
+    # column's selection (and inside `scope`), in display order; values without rows
+    # are left out. Only the matching rows are visited, so narrowing options costs
+    # O(selected rows).
+    def options(self, column, selections, weights=None, scope=None):
+        index = self.columns[column]
+        rows = self.rows({col: values for col, values in selections.items() if col != column}, scope)
+        codes = index.codes if rows is None else index.codes[rows]
+        if weights is not None and rows is not None:
+            weights = weights[rows]
+        valid = codes >= 0
+        counts = np.bincount(
+            codes[valid],
+            weights=None if weights is None else weights[valid],
+            minlength=len(index.values),
+        )
+        return {index.values[code]: int(counts[code]) for code in index.order if counts[code] > 0}
+
+    def select(self, frame, selections):
+        rows = self.rows(selections)
+        if rows is None:
+            return frame
+        return frame.take(rows)
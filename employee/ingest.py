@@ -0,0 +1,29 @@
+import argparse
+
+import pandas as pd
+
+from employee import columnar
+
+
+# Convert a CSV/Excel export of the employee sheet into a Parquet or Arrow file:
+#   python -m employee.ingest export.csv employees.arrow
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the employee sheet export to a columnar file.")
+    parser.add_argument("export", help="CSV or Excel export of the employee sheet")
+    parser.add_argument("output", help="Target .parquet or .arrow/.feather file")
+    args = parser.parse_args(argv)
+
+    if not columnar.is_columnar_path(args.output):
+        parser.error("output must end in .parquet, .pq, .arrow, .feather or .ipc")
+
+    if args.export.lower().endswith(('.xlsx', '.xls')):
+        frame = pd.read_excel(args.export)
+    else:
+        frame = pd.read_csv(args.export)
+
+    columnar.write(frame, args.output)
+    print(f"Wrote {len(frame):,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
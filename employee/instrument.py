@@ -0,0 +1,88 @@
+import json
+import os
+import time
+import tracemalloc
+import uuid
+import weakref
+from contextlib import contextmanager, nullcontext
+
+from employee.memory import start_tracing, stop_tracing
+
+
+# Opt-in timing and memory spans for one rerun. When disabled, span() is a no-op.
+# Spans are written as OpenTelemetry-style JSON lines (trace/span/parent ids,
+# start/end in unix nanoseconds, attributes) so they can be loaded by other tools.
+class Profiler:
+    def __init__(self, enabled=False, log_path=None, **attributes):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.attributes = attributes
+        self.trace_id = uuid.uuid4().hex
+        self.spans = []
+        self.stack = []
+        # Hold tracemalloc until flush(), or until the profiler is dropped if a rerun
+        # ends early (st.stop, an exception)
+        self.tracing = None
+        if enabled:
+            start_tracing()
+            self.tracing = weakref.finalize(self, stop_tracing)
+
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return nullcontext(attributes)
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name, attributes):
+        span = {
+            'name': name,
+            'trace_id': self.trace_id,
+            'span_id': uuid.uuid4().hex[:16],
+            'parent_id': self.stack[-1]['span_id'] if self.stack else None,
+            'depth': len(self.stack),
+            'attributes': attributes,
+        }
+        self.spans.append(span)
+        self.stack.append(span)
+        start_memory, _ = tracemalloc.get_traced_memory()
+        span['start_time_unix_nano'] = time.time_ns()
+        start = time.perf_counter()
+        try:
+            # The body may add attributes (e.g. result sizes) to the yielded dict
+            yield attributes
+        finally:
+            span['duration_ms'] = (time.perf_counter() - start) * 1e3
+            span['end_time_unix_nano'] = span['start_time_unix_nano'] + int(span['duration_ms'] * 1e6)
+            span['memory_delta_bytes'] = tracemalloc.get_traced_memory()[0] - start_memory
+            self.stack.pop()
+
+    # Rows for the sidebar panel, indented by nesting depth
+    def table(self):
+        return [
+            {
+                'stage': " " * span['depth'] + span['name'],
+                'ms': round(span['duration_ms'], 2),
+                'memory KB': round(span['memory_delta_bytes'] / 1024, 1),
+                'details': ", ".join(f"{key}={value}" for key, value in span['attributes'].items()),
+            }
+            for span in self.spans
+            if 'duration_ms' in span
+        ]
+
+    # Write the spans to the log and release tracemalloc; safe to call more than once
+    def flush(self):
+        if self.enabled and self.log_path and self.spans:
+            with open(self.log_path, 'a') as log:
+                for span in self.spans:
+                    record = {key: value for key, value in span.items() if key != 'depth'}
+                    record['attributes'] = {**self.attributes, **span['attributes']}
+                    log.write(json.dumps(record, default=str) + "\n")
+        self.spans = []
+        if self.tracing is not None:
+            # A finalizer runs once, whether called here or on garbage collection
+            self.tracing()
+
+
+# Profiling is on for ?profile=1 or EMPLOYEE_PROFILE=1
+def profiling_requested(query_params):
+    return query_params.get("profile") == "1" or os.environ.get("EMPLOYEE_PROFILE") == "1"
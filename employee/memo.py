@@ -0,0 +1,53 @@
+import pickle
+import threading
+from collections import OrderedDict
+
+
+# Hashable, order-independent form of the sidebar selections; empty filters are dropped
+def normalize_selections(selections):
+    return tuple(sorted((col, tuple(sorted(map(str, values)))) for col, values in selections.items() if values))
+
+
+# Approximate size of a cached value (tables, figures) in bytes
+def sizeof(value):
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+# LRU cache of computed page results, bounded by total size in MB. Entries belong
+# to one data version; the first request for a new version drops all of them.
+class MemoCache:
+    def __init__(self, max_mb=64):
+        self.max_bytes = int(max_mb * 2**20)
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.size = 0
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, key, compute):
+        with self.lock:
+            if version != self.version:
+                self.clear()
+                self.version = version
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+
+        value = compute()
+        size = sizeof(value)
+        with self.lock:
+            # Values larger than the whole budget are returned but not kept
+            if version == self.version and size <= self.max_bytes and key not in self.entries:
+                self.entries[key] = (value, size)
+                self.size += size
+                while self.size > self.max_bytes:
+                    _, (_, evicted) = self.entries.popitem(last=False)
+                    self.size -= evicted
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
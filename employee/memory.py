@@ -0,0 +1,51 @@
+import threading
+import tracemalloc
+from dataclasses import dataclass
+
+# tracemalloc is process-wide, but sessions trace concurrently: it runs while any
+# of them holds it, and only the last release stops it (unless it was already on)
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+# reset_peak() and the peak itself are process-wide too, so traced sections run one
+# at a time; allocations other threads make meanwhile still count, which makes a
+# report an upper bound for the traced call
+_traced_lock = threading.Lock()
+
+
+def start_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def stop_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+@dataclass(frozen=True)
+class MemoryReport:
+    peak: int       # bytes allocated at the high-water mark
+    retained: int   # bytes still allocated when the call returned
+
+
+# Run fn under tracemalloc and report what it allocated
+def traced(fn, *args, **kwargs):
+    with _traced_lock:
+        start_tracing()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            stop_tracing()
+    return result, MemoryReport(peak - before, current - before)
@@ -0,0 +1,109 @@
+import io
+
+import pyarrow as pa
+
+from employee.crosstab import crosstab
+from employee.cube import Cube, row_hashes
+from employee.dimensions import BREAKDOWNS, COUNT_PAGES, CUBE_COLUMNS, DIMENSION_PAGES, FILTER_NAMES, PAGES
+from employee.normalize import hired, normalize
+from employee.suppress import page_min_cell, selection_withheld, suppress_counts, withhold_counts
+
+# Headless access to the dashboard numbers: the same cube, filters and aggregations
+# as app.py, returning plain tables.
+#
+#   cube = load_cube(frame)
+#   table = compute(cube, 'Gender', 'unit', {'unit': ['KGMedia']})
+#   serialize(table, 'csv')
+
+FORMATS = ['json', 'csv', 'arrow']
+
+# Execution paths for compute(): the pandas cube, or SQL over the rows (employee.sql)
+BACKENDS = ['pandas', 'duckdb']
+
+
+# Cube over a raw employee frame (as read from the sheet or a local file), with
+# dates-derived columns as of `as_of` (default today), counting the employees
+# hired by then
+def load_cube(frame, as_of=None):
+    frame = hired(normalize(frame, as_of), as_of)
+    keys = frame[[col for col in CUBE_COLUMNS if col in frame.columns]].reset_index(drop=True)
+    return Cube.from_keys(keys, row_hashes(keys))
+
+
+# Employees per value of `column`, largest first (ties in value order), or by value
+# with sort_by_value
+def counts(cells, column, sort_by_value=False):
+    table = cells.groupby(column, observed=True)['Count'].sum().reset_index()
+    if sort_by_value:
+        return table.sort_values(column, ignore_index=True)
+    return table.sort_values('Count', ascending=False, kind='stable', ignore_index=True)
+
+
+# Crosstab of a dimension page's column against the breakdown, with cells of fewer
+# than `min_cell` people suppressed when set
+def dimension_crosstab(cells, page, breakdown, min_cell=0):
+    dimension = DIMENSION_PAGES[page]
+    return crosstab(cells, breakdown, dimension.column, dimension.categories, weights='Count').suppress(min_cell)
+
+
+# The numbers behind one page as a flat table with Count and Percentage columns.
+# With `min_cell`, suppressed counts have a missing Count and Percentage (callers
+# pick the page's threshold with page_min_cell).
+def page_table(cells, page, breakdown='unit', min_cell=0):
+    if page in DIMENSION_PAGES:
+        legend_title = DIMENSION_PAGES[page].legend_title
+        table = dimension_crosstab(cells, page, breakdown, min_cell).long(breakdown, legend_title, DIMENSION_PAGES[page].categories)
+        return table.drop(columns='Label')[[breakdown, legend_title, 'Count', 'Percentage']]
+    if page in COUNT_PAGES:
+        column = COUNT_PAGES[page]
+        table = counts(cells, column, sort_by_value=column == 'Age')
+    elif page == 'Total':
+        table = counts(cells, breakdown)
+    else:
+        raise ValueError(f"Unknown page {page!r}; expected one of {', '.join(PAGES)}")
+    total = table['Count'].sum()
+    table['Percentage'] = table['Count'] / total * 100 if total else 0.0
+    return suppress_counts(table, min_cell)
+
+
+def compute(cube, page, breakdown='unit', selections=None, min_cell=0):
+    if breakdown not in BREAKDOWNS:
+        raise ValueError(f"Unknown breakdown {breakdown!r}; expected one of {', '.join(BREAKDOWNS)}")
+    table = page_table(cube.select(selections or {}), page, breakdown, page_min_cell(page, selections, min_cell))
+    if min_cell and selection_withheld(lambda column: cube.options(column, selections), selections, min_cell):
+        return withhold_counts(table)
+    return table
+
+
+# Selections from (name, value) pairs, e.g. [('unit', 'KGMedia'), ('tenure', '1-3 Year')].
+# Values may also be comma-separated.
+def parse_filters(pairs):
+    selections = {}
+    for name, value in pairs:
+        if name not in FILTER_NAMES:
+            raise ValueError(f"Unknown filter {name!r}; expected one of {', '.join(FILTER_NAMES)}")
+        values = [part.strip() for part in value.split(',') if part.strip()]
+        selections.setdefault(FILTER_NAMES[name], []).extend(values)
+    return selections
+
+
+# Encode a table as JSON records, CSV or an Arrow IPC stream
+def serialize(table, fmt):
+    if fmt == 'json':
+        return table.to_json(orient='records').encode()
+    if fmt == 'csv':
+        return table.to_csv(index=False).encode()
+    if fmt == 'arrow':
+        sink = io.BytesIO()
+        arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+        with pa.ipc.new_stream(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+        return sink.getvalue()
+    raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
@@ -0,0 +1,82 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from employee.derive import binned, derive, has_dates
+from employee.dimensions import CATEGORY_ORDERS, DIMENSIONS, HIRE_DATE, SORTED_CATEGORIES
+
+
+# Categorical with `order` first and any other observed values after it, sorted
+def categorical(values, order=()):
+    listed = set(order)
+    extra = sorted((value for value in pd.Series(values).dropna().unique() if value not in listed), key=str)
+    return pd.Categorical(values, categories=list(order) + extra)
+
+
+# Dimension values as text. CSV readers turn numeric labels (such as layer numbers)
+# into floats, 4.0 once some are blank, which come back as "4"; missing stays missing.
+def as_text(values):
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        if pd.api.types.infer_dtype(values.cat.categories) == 'string':
+            return values
+        values = values.astype(object)
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind in ('string', 'empty'):
+        return values
+    if kind in ('integer', 'floating', 'mixed-integer-float'):
+        values = pd.to_numeric(values)
+        if (values.dropna() % 1 == 0).all():
+            values = values.astype('Int64')
+    return values.astype(object).map(str, na_action='ignore')
+
+
+# Smallest integer dtype that holds the values; float32 when some are missing or fractional
+def small_number(values):
+    numeric = pd.to_numeric(values, errors='coerce')
+    numeric = pd.to_numeric(numeric, downcast='integer')
+    if numeric.dtype.kind == 'f':
+        numeric = numeric.astype('float32')
+    return numeric
+
+
+# Compact, typed frame for the dashboard, computed once per data load: every
+# dimension column becomes a categorical in its fixed chart order, 'Years' and 'Age'
+# are downcast, and binned dimensions (tenure groups) are computed once. Other columns are shared with
+# `frame`, not copied.
+#
+# When the sheet has birth or hire dates, 'Age', 'generation' and 'Years' are
+# derived from them as of `as_of` (default today). Every row is kept, employees
+# hired later included, so normalizing a normalized frame again re-derives it for
+# any other day; counts come from hired(frame, as_of).
+def normalize(frame, as_of=None):
+    columns = {}
+    if has_dates(frame):
+        columns, _ = derive(frame, as_of or date.today())
+    for col in ('Years', 'Age'):
+        if col in frame.columns or col in columns:
+            columns[col] = small_number(columns.get(col, frame.get(col)))
+    # Replace NaN values in the 'layer' column with "N-A" for display and filtering purposes
+    # (numeric layers read from a CSV become text first, so the categories are all strings)
+    if 'layer' in frame.columns:
+        columns['layer'] = as_text(frame['layer']).astype(object).fillna("N-A")
+    for col in SORTED_CATEGORIES + list(CATEGORY_ORDERS):
+        if col in frame.columns or col in columns:
+            columns[col] = categorical(as_text(columns.get(col, frame.get(col))), CATEGORY_ORDERS.get(col, ()))
+    # Binned dimensions (e.g. 'Years' into tenure groups) so their filters can be indexed
+    for dimension in DIMENSIONS:
+        if dimension.bins is not None and (dimension.source in columns or dimension.source in frame.columns):
+            columns[dimension.column] = binned(columns.get(dimension.source, frame.get(dimension.source)),
+                                               dimension.bins, dimension.categories)
+    return frame.assign(**columns)
+
+
+# Rows of a normalized frame already hired on `as_of` (default today); all of them
+# when the sheet has no hire dates
+def hired(frame, as_of=None):
+    if HIRE_DATE not in frame.columns:
+        return frame
+    hires = frame[HIRE_DATE].to_numpy(dtype='datetime64[D]')
+    employed = np.isnat(hires) | (hires <= np.datetime64(as_of or date.today(), 'D'))
+    return frame if employed.all() else frame[employed]
@@ -0,0 +1,18 @@
+import pandas as pd
+
+
+# Markdown for a "**label**: count" list spread over `columns` columns, one block per
+# column, so each column is a single Streamlit element instead of one per row.
+# layout="split" fills the columns top to bottom; "stripe" deals rows out in turn.
+def count_columns(labels, counts, columns, layout="split", thousands=False):
+    counts = pd.Series(counts).reset_index(drop=True).astype('int64')
+    # An empty map keeps int64, so cast after it (every count may be withheld)
+    counts = (counts.map('{:,}'.format) if thousands else counts).astype(str)
+    lines = "**" + pd.Series(labels).reset_index(drop=True).astype(str) + "**: " + counts
+
+    if layout == "stripe":
+        parts = [lines.iloc[i::columns] for i in range(columns)]
+    else:
+        size = -(-len(lines) // columns)  # rows per column, rounded up
+        parts = [lines.iloc[i * size:(i + 1) * size] for i in range(columns)]
+    return ["\n\n".join(part) for part in parts]
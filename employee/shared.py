@@ -0,0 +1,118 @@
+import threading
+import weakref
+from collections import Counter
+from datetime import date
+
+from employee.cube import CubeMaintainer
+from employee.normalize import hired
+
+
+# What one rerun reads: an immutable snapshot and the cube built from it
+class View:
+    def __init__(self, snapshot, cube, release):
+        self.snapshot = snapshot
+        self.frame = snapshot.frame
+        self.version = snapshot.version
+        self.loaded_at = snapshot.loaded_at
+        self.cube = cube
+        # Runs once, on release() or when the view is garbage collected
+        self._finalizer = weakref.finalize(self, release, snapshot.version)
+
+    def release(self):
+        self._finalizer()
+
+
+# Process-wide owner of the normalized frame and its cube. Every session leases
+# the current version read-only instead of loading its own copy; reference counts
+# show how many reruns still hold each version.
+#
+# Stale-while-revalidate: once the snapshot is older than the store's TTL, readers
+# keep getting it while a background thread re-reads the source and rebuilds the
+# cube, then swaps the new pair in atomically. Only the very first load (and an
+# explicit refresh) happens on the request path.
+#
+# With a `history` store, the cells of every new version are also appended to it.
+class SharedStore:
+    def __init__(self, store, columns, history=None):
+        self.store = store
+        self.history = history
+        self.cubes = CubeMaintainer(columns)
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+        self.leases = Counter()
+        self.current = None         # (snapshot, cube) served to readers
+        self.refreshing = False
+        self.last_error = None      # most recent background refresh failure
+        self.stopped = threading.Event()
+
+    def acquire(self, refresh=False):
+        current = self.current
+        if current is None or refresh:
+            current = self._load()
+        elif self.store.is_stale(current[0]):
+            self.revalidate()
+        snapshot, cube = current
+        with self.lock:
+            self.leases[snapshot.version] += 1
+        return View(snapshot, cube, self._release)
+
+    # Read the source and build the cube, then publish both together
+    def _load(self):
+        with self.load_lock:
+            snapshot = self.store.refresh()
+            # The frame keeps every row; the cube counts those hired by the day it was derived
+            cube = self.cubes.update(snapshot.version, hired(snapshot.frame, date.fromtimestamp(snapshot.loaded_at)))
+            previous = self.current
+            with self.lock:
+                self.current = (snapshot, cube)
+                self.last_error = None
+            if self.history is not None and (previous is None or previous[0].version != snapshot.version):
+                try:
+                    self.history.record(snapshot.version, snapshot.loaded_at, cube.cells)
+                except Exception as error:
+                    # The dashboard keeps serving; the next new version is recorded again
+                    self.last_error = error
+            return snapshot, cube
+
+    # Start a background reload unless one is already running
+    def revalidate(self):
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+        threading.Thread(target=self._background_load, name="employee-refresh", daemon=True).start()
+
+    def _background_load(self):
+        try:
+            self._load()
+        except Exception as error:
+            # Keep serving the previous snapshot; the next stale read retries
+            self.last_error = error
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+    # Re-read the source every `interval` seconds until stop() is called
+    def start_refresher(self, interval):
+        def loop():
+            while not self.stopped.wait(interval):
+                self.revalidate()
+        threading.Thread(target=loop, name="employee-refresher", daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def _release(self, version):
+        with self.lock:
+            self.leases[version] -= 1
+            if self.leases[version] <= 0:
+                del self.leases[version]
+
+    def stats(self):
+        with self.lock:
+            return {
+                'current': self.cubes.version,
+                'leases': dict(self.leases),
+                'versions_held': len(self.leases),
+                'refreshing': self.refreshing,
+            }
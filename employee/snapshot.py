@@ -0,0 +1,64 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+# One loaded copy of the employee sheet
+@dataclass(frozen=True)
+class Snapshot:
+    frame: pd.DataFrame
+    version: str        # content fingerprint, changes only when the data changes
+    loaded_at: float    # when this content was first read
+    checked_at: float   # when the source was last checked for changes
+
+
+# Stable fingerprint of a frame's columns and cell values
+def fingerprint(frame):
+    digest = hashlib.sha1()
+    digest.update("\x1f".join(map(str, frame.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+# Keeps the current snapshot; a snapshot is stale once it is older than `ttl` seconds
+# and SharedStore decides when to re-read. `prepare` runs once per new version; the
+# snapshot holds its result. Safe to share between threads: re-reads are serialized.
+class SnapshotStore:
+    def __init__(self, source, ttl=600, clock=time.time, prepare=None):
+        self.source = source
+        self.ttl = ttl
+        self.prepare = prepare
+        self.clock = clock
+        self.snapshot = None
+        self.marker = None
+        self.lock = threading.RLock()
+
+    def is_stale(self, snapshot):
+        return self.clock() - snapshot.checked_at >= self.ttl
+
+    # Re-check the source now. The current snapshot (and its version) is kept when
+    # the source reports no change, so anything keyed on the version stays valid.
+    def refresh(self):
+        with self.lock:
+            return self._refresh()
+
+    def _refresh(self):
+        now = self.clock()
+        marker = self.source.marker()
+        if self.snapshot is not None and marker is not None and marker == self.marker:
+            self.snapshot = Snapshot(self.snapshot.frame, self.snapshot.version, self.snapshot.loaded_at, now)
+            return self.snapshot
+
+        frame = self.source.read()
+        version = fingerprint(frame)
+        if self.snapshot is not None and version == self.snapshot.version:
+            self.snapshot = Snapshot(self.snapshot.frame, version, self.snapshot.loaded_at, now)
+        else:
+            if self.prepare is not None:
+                frame = self.prepare(frame)
+            self.snapshot = Snapshot(frame, version, now, now)
+        self.marker = marker
+        return self.snapshot
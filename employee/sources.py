@@ -0,0 +1,79 @@
+import os
+import time
+
+import pandas as pd
+
+from employee import columnar
+
+
+# Every source takes an optional list of `columns` to keep (e.g. SOURCE_COLUMNS);
+# other columns are never parsed where the format allows it, and dropped otherwise.
+
+
+# Google Sheet behind the Streamlit GSheets connection.
+# ttl=0 bypasses the connection's own cache; the snapshot store decides when to re-read.
+class GSheetsSource:
+    def __init__(self, conn, columns=None):
+        self.conn = conn
+        self.columns = columns
+
+    def read(self):
+        frame = self.conn.read(ttl=0)
+        if self.columns is None:
+            return frame
+        return frame[[col for col in frame.columns if col in self.columns]]
+
+    # The Sheets API has no cheap "last modified" call, so every check is a full read
+    def marker(self):
+        return None
+
+
+# Local stand-in for the sheet: a CSV export on disk
+class CsvSource:
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = columns
+
+    def read(self):
+        if self.columns is None:
+            return pd.read_csv(self.path)
+        wanted = set(self.columns)
+        return pd.read_csv(self.path, usecols=lambda col: col in wanted)
+
+    # The file's modification time tells us whether a re-read is needed at all
+    def marker(self):
+        return os.path.getmtime(self.path)
+
+
+# Local Parquet/Arrow file written by `python -m employee.ingest`
+class ColumnarSource:
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.columns = columns
+
+    def read(self):
+        return columnar.read(self.path, self.columns)
+
+    def marker(self):
+        return os.path.getmtime(self.path)
+
+
+# Pick the local source for a file by its extension
+def local_source(path, columns=None):
+    if columnar.is_columnar_path(path):
+        return ColumnarSource(path, columns)
+    return CsvSource(path, columns)
+
+
+# Wraps a source with a fixed delay on every read, to stand in for a slow sheet
+class SlowSource:
+    def __init__(self, source, latency):
+        self.source = source
+        self.latency = latency
+
+    def read(self):
+        time.sleep(self.latency)
+        return self.source.read()
+
+    def marker(self):
+        return self.source.marker()
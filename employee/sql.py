@@ -0,0 +1,138 @@
+import threading
+from datetime import date
+
+try:
+    import duckdb
+except ImportError:  # optional: only needed for the duckdb backend
+    duckdb = None
+
+from employee.dimensions import BREAKDOWNS, COUNT_PAGES, DIMENSION_PAGES, PAGES
+from employee.normalize import hired
+from employee.suppress import page_min_cell, selection_withheld, suppress_counts, suppress_long, withhold_counts
+
+# Alternate execution path for the headless tables: the normalized employee rows are
+# loaded into an in-process DuckDB database and every page is one SQL query (GROUP BY
+# plus window-function percentages), run on all cores. Produces the same tables as
+# metrics.page_table over the cube, which stays the default.
+#
+#   backend = DuckDBBackend(hired(normalize(frame)))
+#   table = backend.compute('Gender', 'unit', {'unit': ['KGMedia']})
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# WHERE clause and parameters for sidebar selections ({column: [values]})
+def _where(selections, columns):
+    clauses, params = [], []
+    for col, values in (selections or {}).items():
+        if not values:
+            continue
+        if col not in columns:
+            raise ValueError(f"Unknown filter column {col!r}")
+        clauses.append(f"CAST({_quote(col)} AS VARCHAR) IN ({', '.join('?' * len(values))})")
+        params.extend(str(value) for value in values)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+# Dimension page: every listed dimension value for every breakdown value with
+# employees, grouped by dimension value; percentages are of the breakdown row total
+def _dimension_query(breakdown, column, title, values, where):
+    listed = ", ".join(f"(?, {i})" for i in range(len(values)))
+    query = f"""
+        WITH counts AS (
+            SELECT CAST({_quote(breakdown)} AS VARCHAR) AS b, CAST({_quote(column)} AS VARCHAR) AS d, COUNT(*) AS n
+            FROM employees{where}
+            GROUP BY 1, 2
+            HAVING b IS NOT NULL AND d IS NOT NULL
+        ),
+        cells AS (SELECT b, d, n, SUM(n) OVER (PARTITION BY b) AS total FROM counts),
+        rows AS (SELECT DISTINCT b, total FROM cells),
+        listed(d, position) AS (VALUES {listed})
+        SELECT rows.b AS {_quote(breakdown)}, listed.d AS {_quote(title)},
+               COALESCE(cells.n, 0) AS "Count",
+               CAST(COALESCE(cells.n, 0) AS DOUBLE) / rows.total * 100 AS "Percentage"
+        FROM rows CROSS JOIN listed LEFT JOIN cells USING (b, d)
+        ORDER BY listed.position, rows.b
+    """
+    return query, list(values)
+
+
+# Count page: employees per value, largest first (or by value), with the share of all
+def _count_query(column, sort_by_value, where):
+    order = "key" if sort_by_value else '"Count" DESC, key'
+    query = f"""
+        SELECT {_quote(column)} AS key, COUNT(*) AS "Count"
+        FROM employees{where}
+        GROUP BY 1
+        HAVING key IS NOT NULL
+    """
+    query = f"""
+        SELECT key AS {_quote(column)}, "Count",
+               CAST("Count" AS DOUBLE) / SUM("Count") OVER () * 100 AS "Percentage"
+        FROM ({query})
+        ORDER BY {order}
+    """
+    return query
+
+
+class DuckDBBackend:
+    def __init__(self, frame, threads=None):
+        if duckdb is None:
+            raise ImportError("The duckdb backend needs the duckdb package (pip install duckdb)")
+        self.connection = duckdb.connect()
+        if threads:
+            self.connection.execute(f"SET threads = {int(threads)}")
+        self.connection.register('frame', frame)
+        self.connection.execute("CREATE TABLE employees AS SELECT * FROM frame")
+        self.connection.unregister('frame')
+        self.columns = list(frame.columns)
+
+    # Same contract as metrics.compute
+    def compute(self, page, breakdown='unit', selections=None, min_cell=0):
+        if breakdown not in BREAKDOWNS:
+            raise ValueError(f"Unknown breakdown {breakdown!r}; expected one of {', '.join(BREAKDOWNS)}")
+        where, params = _where(selections, self.columns)
+        if page in DIMENSION_PAGES:
+            dimension = DIMENSION_PAGES[page]
+            query, listed = _dimension_query(breakdown, dimension.column, dimension.legend_title, dimension.categories, where)
+            params = params + listed
+        elif page in COUNT_PAGES:
+            column = COUNT_PAGES[page]
+            query = _count_query(column, column == 'Age', where)
+        elif page == 'Total':
+            query = _count_query(breakdown, False, where)
+        else:
+            raise ValueError(f"Unknown page {page!r}; expected one of {', '.join(PAGES)}")
+        # A cursor per call: queries from several threads run side by side
+        table = self.connection.cursor().execute(query, params).df()
+        if min_cell and selection_withheld(lambda column: self.options(column, selections), selections, min_cell):
+            return withhold_counts(table)
+        if page in DIMENSION_PAGES:
+            return suppress_long(table, breakdown, DIMENSION_PAGES[page].legend_title, min_cell)
+        return suppress_counts(table, page_min_cell(page, selections, min_cell))
+
+
+    # {value: employees} of `column` under every other column's selection, as Cube.options
+    def options(self, column, selections):
+        where, params = _where({col: values for col, values in selections.items() if col != column}, self.columns)
+        query = f"""
+            SELECT {_quote(column)} AS key, COUNT(*) AS n
+            FROM employees{where}
+            GROUP BY 1
+            HAVING key IS NOT NULL
+        """
+        return dict(self.connection.cursor().execute(query, params).fetchall())
+
+
+# One backend per data version, rebuilt when the snapshot changes
+_current = None
+_current_lock = threading.Lock()
+
+def backend_for(snapshot):
+    global _current
+    with _current_lock:
+        if _current is None or _current[0] != snapshot.version:
+            _current = (snapshot.version, DuckDBBackend(hired(snapshot.frame, date.fromtimestamp(snapshot.loaded_at))))
+        return _current[1]
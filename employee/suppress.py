@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+from employee.dimensions import DIMENSION_COLUMNS, DIMENSION_PAGES
+
+# Small-cell suppression for the dimension tables. With a threshold k, any count of
+# 1 to k-1 people is hidden (primary suppression). Row totals and the grand total
+# stay published (they are the Total page), as do the column totals shown above each
+# chart unless they are small themselves, so a line (row or column, totals included)
+# with a single hidden cell would give it away as total minus the rest. Such a line
+# also hides its smallest visible cell (complementary suppression), repeated until
+# no line has exactly one hidden cell.
+#
+# Everything works on whole count matrices, or on a stack of them (..., rows, columns)
+# such as one matrix per history version.
+#
+# Under a dimension filter every other count is a dimension cell too (employees of
+# one religion per subunit, per region, ...), so the Total, Region and Age tables and
+# the sidebar option counts get the same treatment then.
+
+
+# Complete `hidden` over `table` (..., rows, columns), every row and column of which
+# is a line with a known sum: each line with one hidden cell also hides its smallest
+# visible cell until none is left. `fixed` cells are never picked. `axes` are the
+# ones lines run along.
+def _complement(table, hidden, fixed=None, axes=(-1, -2)):
+    # Complements are the smallest non-zero cells first; hiding a zero tells little
+    cost = np.where(table > 0, table, table.max(initial=0) + 1).astype(np.float64)
+    if fixed is not None:
+        cost[fixed] = np.inf
+    while True:
+        added = False
+        for axis in axes:
+            lonely = hidden.sum(axis=axis, keepdims=True) == 1
+            if not lonely.any():
+                continue
+            choice = np.where(hidden, np.inf, cost)
+            pick = np.argmin(choice, axis=axis, keepdims=True)
+            # Lines without any visible cell left have nothing to pick
+            add = lonely & np.isfinite(np.take_along_axis(choice, pick, axis=axis))
+            if add.any():
+                np.put_along_axis(hidden, pick, np.take_along_axis(hidden, pick, axis=axis) | add, axis=axis)
+                added = True
+        if not added:
+            return hidden
+
+
+# Hidden mask of every cell and of every column total, for counts shaped
+# (..., rows, columns). `hidden` marks cells to hide regardless of their count.
+def hidden_cells(counts, min_cell, hidden=None):
+    counts = np.asarray(counts, dtype=np.int64)
+    # Column totals join the matrix as one more row
+    table = np.concatenate([counts, counts.sum(axis=-2, keepdims=True)], axis=-2)
+    primary = (table > 0) & (table < min_cell)
+    if hidden is not None:
+        primary[..., :-1, :] |= hidden
+    hidden = _complement(table, primary)
+    return hidden[..., :-1, :], hidden[..., -1, :]
+
+
+# Same for a stack of matrices (slices, rows, columns) shown one at a time and as
+# their sum, with the row totals of each published too (only the grand totals are
+# known beforehand). The sum ("All") joins the stack as one more slice, so every
+# cell also lies on a line across the slices and is never given away as the sum
+# minus the other slices. Hidden masks of the cells, the column totals and the row
+# totals, with the sum's last.
+def hidden_slices(counts, min_cell):
+    counts = np.asarray(counts, dtype=np.int64)
+    table = np.concatenate([counts, counts.sum(axis=0, keepdims=True)], axis=0)
+    table = np.concatenate([table, table.sum(axis=-1, keepdims=True)], axis=-1)
+    table = np.concatenate([table, table.sum(axis=-2, keepdims=True)], axis=-2)
+    fixed = np.zeros(table.shape, dtype=bool)
+    fixed[:, -1, -1] = True
+    hidden = _complement(table, (table > 0) & (table < min_cell) & ~fixed, fixed, axes=(-1, -2, -3))
+    return hidden[:, :-1, :-1], hidden[:, -1, :-1], hidden[:, :-1, -1]
+
+
+# Hidden mask of a list of counts whose sum is published (a count page, an option
+# list): counts under `min_cell`, plus the smallest other one when only one is
+def hidden_counts(counts, min_cell):
+    counts = np.asarray(counts, dtype=np.int64)
+    return _complement(counts[None, :], ((counts > 0) & (counts < min_cell))[None, :])[0]
+
+
+def dimension_filtered(selections):
+    return any(values for col, values in (selections or {}).items() if col in DIMENSION_COLUMNS)
+
+
+# Threshold for the option counts of a filter on `column`: always for a dimension,
+# and for any other column while a dimension filter is active (0 = none)
+def options_min_cell(column, selections, min_cell):
+    others = {col: values for col, values in (selections or {}).items() if col != column}
+    return min_cell if column in DIMENSION_COLUMNS or dimension_filtered(others) else 0
+
+
+# Values of an option list ({value: count}, as from Cube.options) hidden by
+# hidden_counts. Values are ranked by their text first, so ties between complements
+# go the same way however the list is ordered.
+def hidden_options(options, min_cell):
+    values = sorted(options, key=str)
+    hidden = hidden_counts([options[value] for value in values], min_cell)
+    return {value for value, hide in zip(values, hidden) if hide}
+
+
+# Whether a selected value is hidden in its own filter's option list, as a small
+# count or as a complement. Every count the selection leaves sums to that value's
+# count, so all of them are withheld then. `options(column)` gives the list under
+# the other filters.
+def selection_withheld(options, selections, min_cell):
+    for column, values in (selections or {}).items():
+        threshold = options_min_cell(column, selections, min_cell) if values else 0
+        if threshold:
+            hidden = {str(value) for value in hidden_options(options(column), threshold)}
+            if any(str(value) in hidden for value in values):
+                return True
+    return False
+
+
+# Threshold for a page under `selections`: always on dimension pages, and on the
+# Total, Region and Age pages when a dimension filter is active (0 = none)
+def page_min_cell(page, selections, min_cell):
+    return min_cell if page in DIMENSION_PAGES or dimension_filtered(selections) else 0
+
+
+# Count table (one row per value, with Count and optionally Percentage) with the
+# counts hidden by hidden_counts missing
+def suppress_counts(table, min_cell):
+    if not min_cell or table.empty:
+        return table
+    hidden = hidden_counts(table['Count'], min_cell)
+    table = table.copy()
+    table['Count'] = table['Count'].astype('Int64').mask(hidden)
+    if 'Percentage' in table.columns:
+        table['Percentage'] = table['Percentage'].mask(hidden)
+    return table
+
+
+# Copy of a page table (Count and Percentage columns) with every count withheld
+def withhold_counts(table):
+    table = table.copy()
+    table['Count'] = pd.Series(pd.NA, index=table.index, dtype='Int64')
+    table['Percentage'] = float('nan')
+    return table
+
+
+# Suppress a long table (one row per `row` x `column` value with Count and
+# Percentage, and per `by` value when given) as the matrices it flattens: hidden
+# cells get a missing Count and Percentage.
+def suppress_long(table, row, column, min_cell, by=None):
+    if not min_cell or table.empty:
+        return table
+    group_codes, groups = pd.factorize(table[by]) if by else (np.zeros(len(table), dtype=np.int64), [None])
+    row_codes, rows = pd.factorize(table[row])
+    column_codes, columns = pd.factorize(table[column])
+    counts = np.zeros((len(groups), len(rows), len(columns)), dtype=np.int64)
+    counts[group_codes, row_codes, column_codes] = table['Count'].to_numpy(dtype=np.int64)
+    hidden = hidden_cells(counts, min_cell)[0][group_codes, row_codes, column_codes]
+
+    table = table.copy()
+    table['Count'] = table['Count'].astype('Int64').mask(hidden)
+    table['Percentage'] = table['Percentage'].mask(hidden)
+    return table
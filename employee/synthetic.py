@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from employee.derive import BIRTH_DATE, HIRE_DATE
+from employee.dimensions import GENDER_COLORS, GENERATION_YEARS, RELIGION_COLORS
+
+# Synthetic employee sheets with realistic shapes, for benchmarks and local runs:
+#   generate(100_000).to_csv("employees.csv", index=False)
+
+REGIONS = [
+    'DKI Jakarta', 'Jawa Barat', 'Jawa Tengah', 'Jawa Timur', 'DI Yogyakarta', 'Banten', 'Bali',
+    'Sumatera Utara', 'Sumatera Barat', 'Sumatera Selatan', 'Riau', 'Kepulauan Riau', 'Lampung',
+    'Kalimantan Barat', 'Kalimantan Timur', 'Kalimantan Selatan', 'Sulawesi Selatan', 'Sulawesi Utara',
+    'Nusa Tenggara Barat', 'Nusa Tenggara Timur', 'Maluku', 'Papua',
+]
+LAYERS = ['1', '2', '3', '4', '5', '6']
+
+# Rough headcount shares
+RELIGION_SHARES = [0.70, 0.12, 0.10, 0.03, 0.03, 0.01, 0.01]
+REGION_SHARES = np.geomspace(1, 0.02, len(REGIONS))
+LAYER_SHARES = [0.02, 0.05, 0.13, 0.25, 0.30, 0.25]
+
+
+def _shares(weights):
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+
+# `rows` employees in `units` units with about `subunits` subunits between them.
+# Each subunit belongs to one unit, ages span 18-64 with generation derived from the
+# birth year, tenure never exceeds working age, and a few layers are missing.
+# With `dates`, birth and hire dates consistent with 'Age' and 'Years' on
+# 31 December of `as_of_year` are added.
+def generate(rows, seed=0, units=12, subunits=300, as_of_year=2024, dates=False):
+    rng = np.random.default_rng(seed)
+    unit_names = np.array([f'Unit {i + 1:02d}' for i in range(units)], dtype=object)
+    subunit_unit = rng.integers(0, units, subunits)
+    subunit_names = np.array([f'{unit_names[u]} / Subunit {i + 1:03d}' for i, u in enumerate(subunit_unit)], dtype=object)
+
+    # Larger subunits are more common than small ones
+    subunit = rng.choice(subunits, rows, p=_shares(rng.pareto(1.5, subunits) + 1))
+    age = rng.integers(18, 65, rows)
+    birth_year = as_of_year - age
+    generation_starts = np.array([start for start, _ in GENERATION_YEARS.values()])
+    generation_names = np.array(list(GENERATION_YEARS), dtype=object)
+    generation = generation_names[np.searchsorted(generation_starts, birth_year, side='right') - 1]
+    years = np.minimum(rng.exponential(6, rows).astype(int), age - 18)
+
+    layer = np.array(LAYERS, dtype=object)[rng.choice(len(LAYERS), rows, p=LAYER_SHARES)]
+    layer[rng.random(rows) < 0.02] = None
+
+    frame = pd.DataFrame({
+        'unit': unit_names[subunit_unit[subunit]],
+        'subunit': subunit_names[subunit],
+        'layer': layer,
+        'gender': np.array(list(GENDER_COLORS), dtype=object)[rng.integers(0, 2, rows)],
+        'generation': generation,
+        'Religious Denomination Key': np.array(list(RELIGION_COLORS), dtype=object)[
+            rng.choice(len(RELIGION_COLORS), rows, p=RELIGION_SHARES)],
+        'region': np.array(REGIONS, dtype=object)[rng.choice(len(REGIONS), rows, p=_shares(REGION_SHARES))],
+        'Years': years,
+        'Age': age,
+    })
+    if dates:
+        year = np.datetime64(str(as_of_year), 'Y')
+        frame[BIRTH_DATE] = (year - age.astype('m8[Y]')).astype('M8[D]') + rng.integers(0, 365, rows).astype('m8[D]')
+        frame[HIRE_DATE] = (year - years.astype('m8[Y]')).astype('M8[D]') + rng.integers(0, 365, rows).astype('m8[D]')
+    return frame
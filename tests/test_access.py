@@ -0,0 +1,97 @@
+import json
+import random
+
+import numpy as np
+import pytest
+
+from employee import metrics
+from employee.access import EVERYTHING, grant_for, load_grants, scope_mask
+from employee.normalize import normalize
+from employee.synthetic import generate
+
+FILTERED = ['unit', 'subunit', 'layer', 'gender', 'generation']
+
+
+@pytest.fixture(scope='module')
+def data():
+    raw = generate(20_000)
+    return normalize(raw), metrics.load_cube(raw)
+
+
+def random_grant(rng, units, subunits):
+    grant = {'unit': rng.sample(units, rng.randint(0, 2)), 'subunit': rng.sample(subunits, rng.randint(0, 3))}
+    return {col: values for col, values in grant.items() if values}
+
+
+def random_selections(rng, frame):
+    selections = {}
+    for col in rng.sample(FILTERED, rng.randint(0, 2)):
+        values = sorted(frame[col].dropna().astype(str).unique())
+        selections[col] = rng.sample(values, min(len(values), rng.randint(1, 3)))
+    return selections
+
+
+# Rows of `frame` a grant may see, by a plain pandas filter
+def allowed_rows(frame, grant):
+    allowed = np.zeros(len(frame), dtype=bool)
+    for col, values in grant.items():
+        allowed |= frame[col].astype(str).isin(values).to_numpy()
+    return allowed
+
+
+# Random grants and sidebar filters: no cell outside the grant reaches an aggregate
+# or an option list, and the scoped totals are those of the allowed rows
+def test_scope_never_leaks(data):
+    frame, cube = data
+    rng = random.Random(1)
+    units = sorted(frame['unit'].astype(str).unique())
+    subunits = sorted(frame['subunit'].astype(str).unique())
+    for _ in range(200):
+        grant, selections = random_grant(rng, units, subunits), random_selections(rng, frame)
+        scope = scope_mask(cube.index, grant)
+        cells = cube.take(cube.index.rows(selections, scope), ['unit', 'subunit', 'gender'])
+        assert allowed_rows(cells, grant).all(), (grant, selections)
+
+        expected = allowed_rows(frame, grant)
+        for col, values in selections.items():
+            expected &= frame[col].astype(str).isin(values).to_numpy()
+        assert int(cells['Count'].sum()) == int(expected.sum()), (grant, selections)
+        got = cells.groupby('gender', observed=True)['Count'].sum()
+        want = frame[expected].groupby('gender', observed=True).size()
+        assert got.reindex(want.index, fill_value=0).tolist() == want.tolist(), (grant, selections)
+
+        visible = set(frame.loc[allowed_rows(frame, grant), 'unit'].astype(str))
+        assert set(map(str, cube.options('unit', selections, scope))) <= visible, (grant, selections)
+
+
+def test_everything_is_unscoped(data):
+    _, cube = data
+    assert scope_mask(cube.index, EVERYTHING) is None
+
+
+def write_grants(tmp_path, mapping):
+    path = tmp_path / "access.json"
+    path.write_text(json.dumps(mapping))
+    return path
+
+
+def test_load_grants(tmp_path):
+    grants = load_grants(write_grants(tmp_path, {
+        "Lead@X.com": "*",
+        "editor@x.com": {"unit": ["KGMedia"], "subunit": []},
+        "*": {"subunit": [7]},
+    }))
+    assert grant_for(grants, " lead@x.com") == EVERYTHING
+    assert grant_for(grants, "editor@x.com") == {'unit': ['KGMedia']}
+    assert grant_for(grants, "someone@x.com") == {'subunit': ['7']}
+    assert grant_for(grants, None) == {'subunit': ['7']}
+
+
+@pytest.mark.parametrize('grant', [
+    {"unit": "KGMedia"},
+    {"unit": ["KGMedia"], "region": ["Bali"]},
+    ["KGMedia"],
+])
+def test_load_grants_rejects_malformed(tmp_path, grant):
+    with pytest.raises(ValueError):
+        load_grants(write_grants(tmp_path, {"a@x.com": grant}))